@@ -9,9 +9,14 @@
 from pathlib import Path # Used for file manipulation
 import openpyxl # For reading in verses
 from operator import itemgetter # Used for sorting lists
+import heapq # Used to merge sorted chapter lists
 import xlsxwriter # Used to write quizzes to excel files
 import time # Used to time exception speed
-from tkinter import filedialog, messagebox # Used for GUI design
+import random # Used to seed MinHash functions
+import zlib # Used to hash shingles
+import MaterialPack # Used to compile and load material packs
+import bisect # Used to find the entry of a preview row
+from tkinter import filedialog, messagebox, ttk # Used for GUI design
 import tkinter as tk # Used for GUI design
 
 
@@ -43,27 +48,302 @@ class MainApp(tk.Tk):
 
         start_time = time.time()
         lM = ListMaker()
-        status = lM.importVerses(versesFile)
+        status = lM.importPackedVerses(versesFile)
         if status != 0: messagebox.showerror("Error", status); return
-        status = lM.createConcordance()
-        if status != 0: messagebox.showerror("Error", status); return
-        status = lM.createUniqueWords()
-        if status != 0: messagebox.showerror("Error", status); return
-        status = lM.createTwoWordPhrases()
-        if status != 0: messagebox.showerror("Error", status); return
-        status = lM.createThreeWordPhrases()
-        if status != 0: messagebox.showerror("Error", status); return
-        status = lM.createFtvs()
-        if status != 0: messagebox.showerror("Error", status); return
-        status = lM.createFts()
-        if status != 0: messagebox.showerror("Error", status); return
-        status = lM.createSits()
+        status = lM.createLists()
         if status != 0: messagebox.showerror("Error", status); return
         status = lM.exportLists(exportFile)
         if status != 0: messagebox.showerror("Error", status); return
         print("Done in: {:.2f}s".format(time.time() - start_time))
         messagebox.showinfo("Finished!", "Lists have been generated!")
 
+        # Optionally browse the lists in memory without opening the output file
+        if messagebox.askyesno("Preview", "Would you like to preview the lists?"):
+            self.wait_window(ListPreview(self, lM))
+
+
+class ListPreview(tk.Toplevel):
+    """
+        A class to preview the lists of a ListMaker in a window.
+
+        Only the rows that fit in the window are put in the Treeview. They are read from the ListMaker by row
+        number as the window scrolls, so even the largest lists open and scroll instantly.
+
+        Attributes:
+            listMaker (ListMaker): The ListMaker with the lists to preview.
+            listSources (dictionary of list sources): The columns, entries, filter text, row count and row function
+                of each list.
+            entries (array): The entries of the current list that match the filter.
+            rowOffsets (array of int): The first row of each entry in entries.
+            numRows (int): The number of rows in the current list that match the filter.
+            firstRow (int): The row shown at the top of the window.
+            visibleRows (int): The number of rows that fit in the window.
+            filterText (str): The filter the entries were last matched against.
+            filterJob (str): The pending filter update (If any).
+        """
+
+    def __init__(self, parent, listMaker):
+        """
+        The constructor for class ListPreview.
+
+        Parameters:
+            parent (tk.Tk): The parent window.
+            listMaker (ListMaker): The ListMaker with the lists to preview.
+        """
+
+        tk.Toplevel.__init__(self, parent)
+        self.title("List Preview")
+        self.geometry("1000x600")
+
+        self.listMaker = listMaker
+        self.listSources = self.createListSources()
+        self.entries = []
+        self.rowOffsets = []
+        self.numRows = 0
+        self.firstRow = 0
+        self.visibleRows = 25
+        self.filterText = ""
+        self.filterJob = None
+
+        # List and filter selection
+        controls = tk.Frame(self)
+        controls.pack(side = tk.TOP, fill = tk.X)
+        tk.Label(controls, text = "List:").pack(side = tk.LEFT)
+        self.listChoice = ttk.Combobox(controls, values = list(self.listSources), state = "readonly", width = 30)
+        self.listChoice.pack(side = tk.LEFT)
+        self.listChoice.bind("<<ComboboxSelected>>", lambda event: self.selectList(self.listChoice.get()))
+        tk.Label(controls, text = "Filter:").pack(side = tk.LEFT)
+        self.filterBox = tk.Entry(controls, width = 40)
+        self.filterBox.pack(side = tk.LEFT, fill = tk.X, expand = True)
+        self.filterBox.bind("<KeyRelease>", self.scheduleFilter)
+        self.rowCount = tk.Label(controls)
+        self.rowCount.pack(side = tk.RIGHT)
+
+        # The Treeview only holds the visible rows, so the scrollbar is driven by the row number instead
+        self.scrollbar = ttk.Scrollbar(self, orient = tk.VERTICAL, command = self.scrollRows)
+        self.scrollbar.pack(side = tk.RIGHT, fill = tk.Y)
+        self.tree = ttk.Treeview(self, show = "headings", selectmode = "browse")
+        self.tree.pack(side = tk.LEFT, fill = tk.BOTH, expand = True)
+        self.tree.bind("<Configure>", self.resizeRows)
+        self.tree.bind("<MouseWheel>", lambda event: self.scrollRows("scroll", -3 if event.delta > 0 else 3, "units"))
+        self.tree.bind("<Button-4>", lambda event: self.scrollRows("scroll", -3, "units"))
+        self.tree.bind("<Button-5>", lambda event: self.scrollRows("scroll", 3, "units"))
+        self.tree.bind("<Prior>", lambda event: self.scrollRows("scroll", -1, "pages"))
+        self.tree.bind("<Next>", lambda event: self.scrollRows("scroll", 1, "pages"))
+        self.tree.bind("<Home>", lambda event: self.scrollRows("moveto", 0))
+        self.tree.bind("<End>", lambda event: self.scrollRows("moveto", 1))
+
+        self.listChoice.current(0)
+        self.selectList(self.listChoice.get())
+
+    def createListSources(self):
+        """
+        Function to describe how to read the rows of each list, matching the worksheets of ListMaker.exportLists.
+
+        Returns:
+            listSources (dictionary of list sources): The columns and a function to get the entries, the filter
+            text of an entry, the number of rows in an entry and a row of an entry for each list.
+        """
+
+        lM = self.listMaker
+        reference = ["Book", "Chapter", "Verse"]
+        listSources = {}
+        listSources["All Verses"] = [reference + ["Verse Text"], lambda: lM.allVerses, lambda verse: verse[3],
+                                     lambda verse: 1, lambda verse, j: verse[0:4]]
+        listSources["Concordance"] = [["Word"] + reference + ["Occurrence"], lambda: sorted(lM.concordance.items()),
+                                      lambda item: item[0], lambda item: 1 + len(item[1][1]),
+                                      lambda item, j: [item[0] + " (" + str(item[1][0]) + ")", "", "", "", ""]
+                                      if j == 0 else [item[0]] + item[1][1][j - 1][0:4]]
+        for name, phrases in [["Unique Words", lM.uniqueWords], ["Two Word Phrases", lM.twoWordPhrases],
+                              ["Three Word Phrases", lM.threeWordPhrases],
+                              ["Minimal Unique Phrases", lM.minimalUniquePhrases]]:
+            listSources[name] = [reference + ["Phrase"], lambda phrases = phrases: sorted(phrases.items()),
+                                 lambda item: item[0], lambda item: 1, lambda item, j: item[1][0:3] + [item[0]]]
+        for length, count, exactCount in lM.frequencyLists:
+            name = ("Words" if length == 1 else str(length) + " Word Phrases") + \
+                   (" x" if exactCount else " x1-") + str(count)
+            listSources[name] = [reference + ["Phrase", "Count"],
+                                 lambda length = length, count = count, exactCount = exactCount:
+                                 lM.getFrequencyList(count, length, exactCount),
+                                 lambda item: item[0], lambda item: len(item[2]),
+                                 lambda item, j: item[2][j][0:3] + [item[0], item[1]]]
+        listSources["FTVs"] = [reference + ["Question", "Answer"], lambda: lM.ftvs, lambda verse: verse[0],
+                               lambda verse: 1,
+                               lambda verse, j: verse[3:6] + [lM.upperFirstAlpha(verse[0]) + "...", verse[8]]]
+        listSources["FTs"] = [reference + ["Verse Start"], lambda: lM.fts, lambda verse: verse[0], lambda verse: 1,
+                              lambda verse, j: verse[3:6] + [verse[0]]]
+        listSources["SITs"] = [reference + ["Quotation"], lambda: lM.sits, lambda verse: verse[0], lambda verse: 1,
+                               lambda verse, j: verse[1:4] + [verse[0]]]
+        listSources["Near-duplicate Verses"] = [reference + ["Verse Text"] + ["Similar " + column for column in
+                                                reference + ["Verse Text"]] + ["Similarity"],
+                                                lambda: lM.nearDuplicates, lambda pair: pair[1][3] + " " + pair[2][3],
+                                                lambda pair: 1, lambda pair, j: pair[1] + pair[2] + [pair[0]]]
+        listSources["Longest Repeats"] = [["Passage", "Words", "References"], lambda: lM.longestRepeats,
+                                          lambda repeat: repeat[0], lambda repeat: 1,
+                                          lambda repeat, j: [repeat[0], repeat[1], "; ".join(
+                                              verse[0] + " " + verse[1] + ":" + verse[2] for verse in repeat[2])]]
+
+        # Only read each list once, the first time it is previewed
+        for source in listSources.values():
+            source[1] = self.cacheEntries(source[1])
+        return listSources
+
+    def cacheEntries(self, getEntries):
+        """
+        Function to wrap a function that gets the entries of a list so it only runs once.
+
+        Parameters:
+            getEntries (function): The function to get the entries of a list.
+
+        Returns:
+            getCachedEntries (function): The function to get the entries of a list.
+        """
+
+        cache = []
+
+        def getCachedEntries():
+            if not cache:
+                cache.append(getEntries())
+            return cache[0]
+        return getCachedEntries
+
+    def selectList(self, listName):
+        """
+        Function to show a list in the Treeview.
+
+        Parameters:
+            listName (str): The name of the list to show.
+        """
+
+        columns = self.listSources[listName][0]
+        self.tree.configure(columns = columns, displaycolumns = columns)
+        for column in columns:
+            self.tree.heading(column, text = column, anchor = tk.W)
+            self.tree.column(column, width = 300 if "Text" in column or column in ["Occurrence", "Answer"] else 100,
+                             stretch = True)
+        self.filterText = None
+        self.applyFilter()
+
+    def scheduleFilter(self, event = None):
+        """
+        Function to apply the filter shortly after the user stops typing.
+
+        Parameters:
+            event (tk.Event): The key event (Not used).
+        """
+
+        if self.filterJob is not None:
+            self.after_cancel(self.filterJob)
+        self.filterJob = self.after(150, self.applyFilter)
+
+    def applyFilter(self):
+        """
+        Function to match the entries of the current list against the filter and show the first rows.
+        """
+
+        self.filterJob = None
+        self.filterEntries(self.listChoice.get(), self.filterBox.get())
+        self.rowCount.configure(text = "{:,} rows".format(self.numRows))
+        self.firstRow = 0
+        self.showRows()
+
+    def filterEntries(self, listName, filterText):
+        """
+        Function to find the entries of a list that contain the filter text (Ignoring case).
+
+        Typing more of a filter only narrows the entries already matched instead of checking the whole list again.
+
+        Parameters:
+            listName (str): The name of the list.
+            filterText (str): The text the entries must contain.
+        """
+
+        _, getEntries, getText, getCount, _ = self.listSources[listName]
+        filterText = filterText.strip().upper()
+        if self.filterText is not None and self.filterText in filterText:
+            entries = self.entries
+        else:
+            entries = getEntries()
+        if filterText:
+            entries = [entry for entry in entries if filterText in getText(entry).upper()]
+        self.entries = entries
+        self.filterText = filterText
+
+        # Record the first row of each entry so a row number can be found with a binary search
+        self.rowOffsets = []
+        numRows = 0
+        for entry in entries:
+            self.rowOffsets.append(numRows)
+            numRows += getCount(entry)
+        self.numRows = numRows
+
+    def getRow(self, row):
+        """
+        Function to get a row of the current list.
+
+        Parameters:
+            row (int): The row number.
+
+        Returns:
+            values (array of str): The values of each column in the row.
+        """
+
+        getRow = self.listSources[self.listChoice.get()][4]
+        i = bisect.bisect_right(self.rowOffsets, row) - 1
+        return getRow(self.entries[i], row - self.rowOffsets[i])
+
+    def showRows(self):
+        """
+        Function to replace the rows in the Treeview with the rows visible from firstRow and update the scrollbar.
+        """
+
+        self.tree.delete(*self.tree.get_children())
+        lastRow = min(self.firstRow + self.visibleRows, self.numRows)
+        for row in range(self.firstRow, lastRow):
+            self.tree.insert("", tk.END, values = self.getRow(row))
+        if self.numRows:
+            self.scrollbar.set(self.firstRow / self.numRows, lastRow / self.numRows)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scrollRows(self, action, amount, unit = None):
+        """
+        Function to scroll the rows, called by the scrollbar in the same way as Treeview.yview.
+
+        Parameters:
+            action (str): "moveto" to move to a fraction of the list or "scroll" to move by units or pages.
+            amount (str): The fraction to move to or the number of units or pages to move.
+            unit (str): "units" for rows or "pages" for the number of visible rows (Only when scrolling).
+
+        Returns:
+            (str): "break" so the Treeview does not also handle the event.
+        """
+
+        if action == "moveto":
+            firstRow = int(float(amount) * self.numRows)
+        else:
+            firstRow = self.firstRow + int(amount) * (self.visibleRows if unit == "pages" else 1)
+        firstRow = max(0, min(firstRow, self.numRows - self.visibleRows))
+        if firstRow != self.firstRow:
+            self.firstRow = firstRow
+            self.showRows()
+        return "break"
+
+    def resizeRows(self, event):
+        """
+        Function to show more or fewer rows when the window is resized.
+
+        Parameters:
+            event (tk.Event): The configure event of the Treeview.
+        """
+
+        rowHeight = int(ttk.Style(self).lookup("Treeview", "rowheight") or 20)
+        visibleRows = max(1, event.height // rowHeight - 1)
+        if visibleRows != self.visibleRows:
+            self.visibleRows = visibleRows
+            self.firstRow = max(0, min(self.firstRow, self.numRows - self.visibleRows))
+            self.showRows()
+
 
 class ListMaker:
     """
@@ -72,6 +352,7 @@ class ListMaker:
         Attributes:
             debug (bool): A debug variable to enable / disable debug outputs.
             allVerses (array of verse objects) A variable to store all of the verses.
+            materialPack (MaterialPack): The memory-mapped material pack the verses were loaded from (If any).
             concordance (dictionary of word objects) A variable to store the concordance.
             uniqueWords (dictionary of word objects) A variable to store all of the unique words.
             twoWordPhrases (dictionary of word objects) A variable to store all of the two word phrases.
@@ -81,6 +362,22 @@ class ListMaker:
             ftvs (array of verse objects) A variable to store all of the ftvs.
             fts (array of partial verse objects) A variable to store all of the fts.
             sits (array of situation objects): A variable to store all of the sits.
+            ftQualifiers (array of str): The strings that mark the start of a valid FT after them.
+            nearDuplicates (array of verse pair objects): A variable to store all of the near-duplicate verses.
+            nearDuplicateThreshold (float): The minimum shingle similarity for two verses to be near-duplicates.
+            nearDuplicatesCreated (bool): Whether the near-duplicates have been created for the verses.
+            phraseCounts (dictionary of phrase count objects): The count and references of every word and phrase by
+                phrase length (Each length is counted the first time it is needed).
+            phraseBuckets (dictionary of count objects): The words and phrases of each phrase length grouped by count.
+            frequencyLists (array of arrays): The phrase length, count and whether the count must be exact of each
+                frequency list to export.
+            minimalUniquePhrases (dictionary of word objects): The unique phrases of at least minimalPhraseLength words
+                that contain no shorter unique phrase.
+            minimalPhraseLength (int): The fewest words in a minimal unique phrase.
+            longestRepeats (array of repeat objects): The longest passages that occur in more than one verse.
+            longestRepeatCount (int): The number of longest repeated passages to keep.
+            chapterAggregates (dictionary of chapter objects): The partial lists of each chapter used to create lists
+                for ranges of chapters.
         """
 
     def __init__(self):
@@ -90,6 +387,7 @@ class ListMaker:
 
         self.debug = "Off"
         self.allVerses = []
+        self.materialPack = None
         self.concordance = {}
         self.uniqueWords = {}
         self.twoWordPhrases = {}
@@ -99,6 +397,18 @@ class ListMaker:
         self.ftvs = []
         self.fts = []
         self.sits = []
+        self.ftQualifiers = [" “", " ‘", ". ", "? ", "! ", "; "]
+        self.nearDuplicates = []
+        self.nearDuplicateThreshold = 0.6
+        self.nearDuplicatesCreated = False
+        self.phraseCounts = {}
+        self.phraseBuckets = {}
+        self.frequencyLists = [[1, 2, True], [2, 3, False]]
+        self.minimalUniquePhrases = {}
+        self.minimalPhraseLength = 4
+        self.longestRepeats = []
+        self.longestRepeatCount = 100
+        self.chapterAggregates = {}
 
     ####################################################################################################################
     # Main Funcs
@@ -112,9 +422,6 @@ class ListMaker:
 
         Returns:
             (0): No errors, (Anything else): Errors.
-
-        Debug Code (All Verses): "A" or "a" or "On"
-        Debug Code (All Verses Split): "W" or "w" or "On"
         """
 
         # Create the path for Verse file
@@ -134,16 +441,117 @@ class ListMaker:
         sheet = book.worksheets[0]  # Open the first sheet
 
         # Read in and parse all verses
-        for row in sheet.iter_rows(min_row = 2, min_col = 1, max_col = 4):
+        return self.parseVerses([cell.value for cell in row]
+                                for row in sheet.iter_rows(min_row = 2, min_col = 1, max_col = 4))
+
+    def importPackedVerses(self, versesFileName = "Verses.xlsx"):
+        """
+        Function to import verses from the compiled material pack of an excel file, compiling the pack first
+        if it is missing or the excel file has changed since it was compiled.
+
+        Parameters:
+            versesFileName (str): The input filename for verse list  (Defaults to "Verses.xlsx").
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        if versesFileName == "Verses.xlsx":
+            versesFileName = str(Path("../Data Files/") / versesFileName)
+
+        sourceHash = MaterialPack.hashMaterial(versesFileName)
+        if sourceHash is None:
+            return "Error 1 => Verses file does not exist!!!"
+
+        # Compile the pack if it is missing, out of date or damaged
+        packFileName = MaterialPack.getPackFileName(versesFileName)
+        pack = MaterialPack.loadPack(packFileName, sourceHash)
+        if pack is None:
+            lM = ListMaker()
+            status = lM.importVerses(versesFileName)
+            if status != 0: return status
+
+            # The pack is only a cache, so use the verses just read if it can not be written or read back
+            if MaterialPack.writePack(lM.allVerses, sourceHash, packFileName) != 0:
+                return self.parseVerses([], lM.allVerses)
+            pack = MaterialPack.loadPack(packFileName, sourceHash)
+            if pack is None:
+                return self.parseVerses([], lM.allVerses)
+
+        self.materialPack = pack
+        return self.parseVerses([], pack.createVerses())
+
+    def closeMaterial(self):
+        """
+        Function to close the material pack the verses were loaded from so the pack file can be replaced.
+
+        The lists are left as they are, since none of them use the pack.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        if self.materialPack is not None:
+            if not self.materialPack.close():
+                return "Error 15 => Material pack is still in use!!! " + self.materialPack.fileName
+            self.materialPack = None
+
+        return 0  # Return with no errors
+
+    def compileMaterial(self, versesFileName = "Verses.xlsx", packFileName = None, sourceHash = None):
+        """
+        Function to compile an excel file into a material pack.
+
+        Parameters:
+            versesFileName (str): The input filename for verse list  (Defaults to "Verses.xlsx").
+            packFileName (str): The output pack filename (Defaults to the input filename with a .lmpack extension).
+            sourceHash (bytes): The hash of the input file (Defaults to hashing the file).
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        if versesFileName == "Verses.xlsx":
+            versesFileName = str(Path("../Data Files/") / versesFileName)
+        if packFileName is None:
+            packFileName = MaterialPack.getPackFileName(versesFileName)
+        if sourceHash is None:
+            sourceHash = MaterialPack.hashMaterial(versesFileName)
+            if sourceHash is None:
+                return "Error 1 => Verses file does not exist!!!"
+
+        # Parse the verses with a separate ListMaker so this one is left unchanged
+        lM = ListMaker()
+        status = lM.importVerses(versesFileName)
+        if status != 0: return status
+
+        return MaterialPack.writePack(lM.allVerses, sourceHash, packFileName)
+
+    def parseVerses(self, rows, splitVerses = None):
+        """
+        Function to check, split and add rows of verse cells to the list of all verses.
+
+        Parameters:
+            rows (iterable of arrays): The Book, Chapter, Verse and Verse Text cell values of each row.
+            splitVerses (array of verse objects): Verses that are already checked and split (Defaults to None).
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+
+        Debug Code (All Verses): "A" or "a" or "On"
+        Debug Code (All Verses Split): "W" or "w" or "On"
+        """
+
+        for row in rows:
             # Check to make sure verse is valid
             verse = []
             valid = False
 
-            for cell in row:
-                if not cell.value:
+            for value in row:
+                if not value:
                     verse.append("")
                 else:
-                    verse.append(str(cell.value).strip())
+                    verse.append(str(value).strip())
                     valid = True
 
             if not valid:
@@ -163,6 +571,10 @@ class ListMaker:
             # Add verse to list of all verses
             self.allVerses.append(verse)
 
+        # Add verses that were already checked and split
+        if splitVerses:
+            self.allVerses += splitVerses
+
         # Print All Verses if debug enabled
         if self.debug != "Off" and ("A" in self.debug or "a" in self.debug or self.debug == "On"):
             print("")
@@ -255,7 +667,7 @@ class ListMaker:
         notUniquePhrases = {}
         for verse in self.allVerses:
             i = 0
-            while i != len(verse[4]) - 1:
+            while i < len(verse[4]) - 1:
                 twoWordPhrase = (str(verse[4][i][0]) + " " + str(verse[4][i + 1][0])).upper()
                 if twoWordPhrase not in notUniquePhrases and twoWordPhrase.split()[0].upper() not in \
                 self.uniqueWords and twoWordPhrase.split()[1].upper() not in self.uniqueWords:
@@ -289,10 +701,9 @@ class ListMaker:
         notUniquePhrases = {}
         for verse in self.allVerses:
             i = 0
-            while i != len(verse[4]) - 2:
+            while i < len(verse[4]) - 2:
                 threeWordPhrase = (str(verse[4][i][0]) + " " + str(verse[4][i + 1][0]) + " " +
                                    str(verse[4][i + 2][0])).upper()
-
                 if threeWordPhrase not in notUniquePhrases and \
                 " ".join(threeWordPhrase.split()[0:2]).upper() not in self.twoWordPhrases and \
                 " ".join(threeWordPhrase.split()[1:3]).upper() not in self.twoWordPhrases and \
@@ -354,66 +765,11 @@ class ListMaker:
         Debug Code: "F" or "f" or "On"
         """
 
-        # Add all verses to FTV list
-        for verse in self.allVerses:
-            firstFiveWords = []
-            RestOfVerse = []
-            i = 0
-            for i, word in enumerate(verse[4]):
-                if i > 4:
-                    i -= 1
-                    break
-                else:
-                    firstFiveWords.append(word[0].upper())
-            #for verse in self.allVerses:
-            numOfWords = verse[3].split(" ")
-            NumLen = len(numOfWords)
-            RestOfVerse = ' '.join(numOfWords[5:NumLen + 1])
-            self.ftvs.append(["", firstFiveWords, i, verse[0], verse[1], verse[2], verse[3], verse[4], RestOfVerse])
-
-        # Sort the FTV list alphabetically
-        self.ftvs = sorted(self.ftvs, key = itemgetter(1, 3, 4, 5))
-
-        currentLine = 0
-        while currentLine != len(self.ftvs):
-            uniqueNumber = None
-
-            # Get the unique number based on previous verse
-            if currentLine != 0:
-                word = 0
-                while word != 5 and word <= self.ftvs[currentLine][2] and word <= self.ftvs[currentLine - 1][2] \
-                    and self.ftvs[currentLine][1][word] == self.ftvs[currentLine - 1][1][word]:
-                    word += 1
-                uniqueNumber = word
-
-            # Get the unique number based on next verse
-            if currentLine != len(self.ftvs) - 1:
-                word = 0
-                while word != 5 and word <= self.ftvs[currentLine][2] and word <= self.ftvs[currentLine + 1][2] \
-                    and self.ftvs[currentLine][1][word] == self.ftvs[currentLine + 1][1][word]:
-                    word += 1
-                if uniqueNumber == None or uniqueNumber < word:
-                    uniqueNumber = word
-
-            # Make the first five words with unique marker
-            if uniqueNumber >= len(self.ftvs[currentLine][1]): # If verse not unique after 5 words
-                end = self.ftvs[currentLine][7][self.ftvs[currentLine][2]][1]
-                while end != len(self.ftvs[currentLine][6]) and self.ftvs[currentLine][6][end] != " ":
-                    end += 1
-                self.ftvs[currentLine][0] = "||" + self.ftvs[currentLine][6][0:end]
-            else:
-                mid = self.ftvs[currentLine][7][uniqueNumber][1] + len(self.ftvs[currentLine][7][uniqueNumber][0])
-                while mid != len(self.ftvs[currentLine][6]) and self.ftvs[currentLine][6][mid] != " ":
-                    mid += 1
-                beforeMarker = self.ftvs[currentLine][6][0:mid]
-
-                end = self.ftvs[currentLine][7][self.ftvs[currentLine][2]][1]
-                while end != len(self.ftvs[currentLine][6]) and self.ftvs[currentLine][6][end] != " ":
-                    end += 1
-                afterMarker = self.ftvs[currentLine][6][mid:end]
-                self.ftvs[currentLine][0] = beforeMarker + " »" + afterMarker
+        # Add all verses to FTV list and sort it alphabetically
+        self.ftvs = sorted(self.ftvs + self.createFtvEntries(self.allVerses), key = itemgetter(1, 3, 4, 5))
 
-            currentLine += 1 # Go to next line
+        # Make the first five words of each verse with unique marker
+        self.markFirstFiveWords(self.ftvs, " »")
 
         # Print FTVs if debug enabled
         if self.debug != "Off" and ("F" in self.debug or "f" in self.debug or self.debug == "On"):
@@ -437,69 +793,11 @@ class ListMaker:
         Debug Code: "T" or "t" or "On"
         """
 
-        # Parse verses that have valid FTs in them
-        tempFts = []
-        for verse in self.allVerses:
-            for ftQualifier in [" “", " ‘", ". ", "? ", "! ", "; "]:
-                if verse[3].find(ftQualifier) != -1:
-                    verseText = verse[3][verse[3].find(ftQualifier) + 2:]
-                    tempFts.append([verse[0], verse[1], verse[2], verseText, self.splitVerse(verseText)])
-
-        # Add all verses to FT list
-        for verse in tempFts:
-            firstFiveWords = []
-            i = 0
-            for i, word in enumerate(verse[4]):
-                if i > 4:
-                    i -= 1
-                    break
-                else:
-                    firstFiveWords.append(word[0].upper())
-            self.fts.append(["", firstFiveWords, i, verse[0], verse[1], verse[2], verse[3], verse[4]])
-
-        # Sort the FT list alphabetically
-        self.fts = sorted(self.fts, key = itemgetter(1, 3, 4, 5))
+        # Add all valid FTs to FT list and sort it alphabetically
+        self.fts = sorted(self.fts + self.createFtEntries(self.allVerses), key = itemgetter(1, 3, 4, 5))
 
-        currentLine = 0
-        while currentLine != len(self.fts):
-            uniqueNumber = None
-
-            # Get the unique number based on previous verse
-            if currentLine != 0:
-                word = 0
-                while word != 5 and word <= self.fts[currentLine][2] and word <= self.fts[currentLine - 1][2] \
-                    and self.fts[currentLine][1][word] == self.fts[currentLine - 1][1][word]:
-                    word += 1
-                uniqueNumber = word
-
-            # Get the unique number based on next verse
-            if currentLine != len(self.fts) - 1:
-                word = 0
-                while word != 5 and word <= self.fts[currentLine][2] and word <= self.fts[currentLine + 1][2] \
-                    and self.fts[currentLine][1][word] == self.fts[currentLine + 1][1][word]:
-                    word += 1
-                if uniqueNumber == None or uniqueNumber < word:
-                    uniqueNumber = word
-
-            # Make the first five words with unique marker
-            if uniqueNumber >= len(self.fts[currentLine][1]):  # If verse not unique after 5 words
-                end = self.fts[currentLine][7][self.fts[currentLine][2]][1]
-                while end != len(self.fts[currentLine][6]) and self.fts[currentLine][6][end] != " ":
-                    end += 1
-                self.fts[currentLine][0] = "||" + self.fts[currentLine][6][0:end]
-            else:
-                mid = self.fts[currentLine][7][uniqueNumber][1] + len(self.fts[currentLine][7][uniqueNumber][0])
-                while mid != len(self.fts[currentLine][6]) and self.fts[currentLine][6][mid] != " ":
-                    mid += 1
-                beforeMarker = self.fts[currentLine][6][0:mid]
-
-                end = self.fts[currentLine][7][self.fts[currentLine][2]][1]
-                while end != len(self.fts[currentLine][6]) and self.fts[currentLine][6][end] != " ":
-                    end += 1
-                afterMarker = self.fts[currentLine][6][mid:end]
-                self.fts[currentLine][0] = beforeMarker + "/" + afterMarker
-
-            currentLine += 1  # Go to next line
+        # Make the first five words of each FT with unique marker
+        self.markFirstFiveWords(self.fts, "/")
 
         # Print FTs if debug enabled
         if "T" in self.debug or "t" in self.debug or self.debug == "On":
@@ -523,15 +821,8 @@ class ListMaker:
         Debug Code: "S" or "s" or "On"
         """
 
-        for verse in self.allVerses:
-            for i, char in enumerate(verse[3]):
-                if char in ["“", "‘"]:
-                    quotation = verse[3][i:]
-                    if quotation != "":
-                        self.sits.append([quotation[1:], verse[0], verse[1], verse[2]])
-
-        # Sort Sits alphabetically
-        self.sits = sorted(self.sits, key = itemgetter(0, 1, 2, 3))
+        # Add all quotations to Sits and sort them alphabetically
+        self.sits = sorted(self.sits + self.createSitEntries(self.allVerses), key = itemgetter(0, 1, 2, 3))
 
         # Print SITs if debug enabled
         if "S" in self.debug or "s" in self.debug or self.debug == "On":
@@ -542,6 +833,377 @@ class ListMaker:
 
         return 0  # Return with no errors
 
+    def createNearDuplicates(self, numHashes = 64, shingleSize = 2):
+        """
+        Function to create a list of verses that differ by only a few words using MinHash signatures and
+        locality-sensitive hashing, so that only verses sharing a band of their signature are compared.
+
+        Parameters:
+            numHashes (int): The number of MinHash functions in each signature (Defaults to 64).
+            shingleSize (int): The number of words in each shingle (Defaults to 2).
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+
+        Debug Code: "N" or "n" or "On"
+        """
+
+        if not 0 < self.nearDuplicateThreshold <= 1:
+            return "Error 8 => Near-duplicate threshold must be between 0 and 1!!!"
+
+        # Create the MinHash functions (a * x + b) mod p with a fixed seed so results are repeatable
+        prime = (1 << 61) - 1
+        generator = random.Random(3267)
+        hashFuncs = [(generator.randrange(1, prime), generator.randrange(0, prime)) for _ in range(numHashes)]
+        bands, rows = self.getLshBands(numHashes, self.nearDuplicateThreshold)
+
+        # Create the shingle set and MinHash signature of every verse
+        shingleHashes = {} # Cache of the hashed values of each distinct shingle
+        allShingles = []
+        buckets = {}
+        for verseIndex, verse in enumerate(self.allVerses):
+            shingles = self.shingleVerse(verse[4], shingleSize)
+            allShingles.append(shingles)
+            if not shingles:
+                continue
+
+            values = []
+            for shingle in shingles:
+                if shingle not in shingleHashes:
+                    x = zlib.crc32(shingle.encode("utf-8"))
+                    shingleHashes[shingle] = tuple((a * x + b) % prime for a, b in hashFuncs)
+                values.append(shingleHashes[shingle])
+            signature = tuple(map(min, zip(*values)))
+
+            # Add the verse to one bucket per band of its signature
+            for band in range(bands):
+                key = (band, signature[band * rows:(band + 1) * rows])
+                if key in buckets:
+                    buckets[key].append(verseIndex)
+                else:
+                    buckets[key] = [verseIndex]
+
+        # Check the candidate pairs that share a bucket
+        checkedPairs = set()
+        for bucket in buckets.values():
+            for i, first in enumerate(bucket):
+                for second in bucket[i + 1:]:
+                    if (first, second) in checkedPairs:
+                        continue
+                    checkedPairs.add((first, second))
+
+                    similarity = len(allShingles[first] & allShingles[second]) / \
+                                 len(allShingles[first] | allShingles[second])
+                    if similarity >= self.nearDuplicateThreshold:
+                        self.nearDuplicates.append([round(similarity, 3), self.allVerses[first][0:4],
+                                                    self.allVerses[second][0:4]])
+
+        # Sort the near-duplicates by most similar first
+        self.nearDuplicates = sorted(self.nearDuplicates, key = lambda pair: (-pair[0], pair[1], pair[2]))
+        self.nearDuplicatesCreated = True
+
+        # Print Near-duplicate verses if debug enabled
+        if self.debug != "Off" and ("N" in self.debug or "n" in self.debug or self.debug == "On"):
+            print("")
+            print("=== Near-duplicate Verses (" + str(len(self.nearDuplicates)) + ") ===")
+            for pair in self.nearDuplicates:
+                print(pair[1][0] + " " + pair[1][1] + ":" + pair[1][2] + " ~ " + pair[2][0] + " " + pair[2][1] + ":" +
+                      pair[2][2] + " (" + str(pair[0]) + ")")
+
+        return 0  # Return with no errors
+
+    def getFrequencyList(self, count, length = 1, exactCount = False):
+        """
+        Function to get the words or phrases that occur exactly or at most a number of times.
+
+        Parameters:
+            count (int): The number of times the words or phrases occur.
+            length (int): The number of words in each phrase (Defaults to 1 for single words).
+            exactCount (bool): Whether the words or phrases must occur exactly count times instead of at most
+                (Defaults to False).
+
+        Returns:
+            frequencyList (array of phrase objects): The phrase, count and reference of each occurrence, sorted
+            alphabetically.
+        """
+
+        # Count the phrases of this length the first time they are asked for
+        if length not in self.phraseCounts:
+            if length == 1 and self.concordance:
+                self.setPhraseCounts(1, {word: [value[0], [occurrence[0:3] for occurrence in value[1]]]
+                                         for word, value in self.concordance.items()})
+            else:
+                self.setPhraseCounts(length, self.countPhrases(self.allVerses, length))
+
+        buckets = self.phraseBuckets[length]
+        if exactCount:
+            phrases = buckets.get(count, [])
+        else:
+            phrases = [phrase for phraseCount, bucket in buckets.items() if phraseCount <= count for phrase in bucket]
+
+        return sorted([phrase] + self.phraseCounts[length][phrase] for phrase in phrases)
+
+    def createSuffixArrayPhrases(self):
+        """
+        Function to create the lists of minimal unique phrases of any length and the longest repeated passages
+        from a word level suffix array of all verses.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+
+        Debug Code: "M" or "m" or "On"
+        """
+
+        if not self.allVerses:
+            return 0  # Return with no errors
+
+        # Create the word ID sequence with a different sentinel after each verse so no phrase crosses verses
+        wordIds = {}
+        referenceIds = {}
+        sequence = []
+        sequenceRefs = []
+        verseEnds = []
+        for verseIndex, verse in enumerate(self.allVerses):
+            referenceId = referenceIds.setdefault((verse[0], verse[1], verse[2]), len(referenceIds))
+            for word in verse[4]:
+                sequence.append(wordIds.setdefault(str(word[0]).upper(), len(wordIds)))
+                sequenceRefs.append(referenceId)
+            sequence.append(-1 - verseIndex)
+            sequenceRefs.append(referenceId)
+            verseEnds.extend([len(sequence) - 1] * (len(verse[4]) + 1))
+
+        suffixArray = self.buildSuffixArray(sequence)
+        lcpArray = self.buildLcpArray(sequence, suffixArray)
+        longestRepeated = self.findLongestRepeated(sequenceRefs, suffixArray, lcpArray)
+        vocabulary = list(wordIds)
+        verseIndexes = [verseIndex for verseIndex, verse in enumerate(self.allVerses) for _ in range(len(verse[4]) + 1)]
+
+        # The shortest unique phrase starting at each word is one word longer than its longest repeat, and it is
+        # minimal when the shortest unique phrase starting at the next word ends after it
+        for position, repeated in enumerate(longestRepeated):
+            length = repeated + 1
+            if sequence[position] < 0 or length < self.minimalPhraseLength or position + length > verseEnds[position]:
+                continue
+            if position + 1 + longestRepeated[position + 1] + 1 <= position + length:
+                continue
+            phrase = " ".join(vocabulary[wordId] for wordId in sequence[position:position + length])
+            self.minimalUniquePhrases[phrase] = self.allVerses[verseIndexes[position]][0:3]
+
+        # Keep the longest repeated passages that are not part of the passage repeated from the word before
+        candidates = []
+        for position, repeated in enumerate(longestRepeated):
+            if repeated == 0 or (position != 0 and sequence[position - 1] >= 0 and
+                                 longestRepeated[position - 1] > repeated):
+                continue
+            candidates.append((-repeated, position))
+        candidates.sort()
+
+        rank = [0] * len(suffixArray)
+        for i, position in enumerate(suffixArray):
+            rank[position] = i
+        seenPhrases = set()
+        for negativeLength, position in candidates:
+            if len(self.longestRepeats) == self.longestRepeatCount:
+                break
+            length = -negativeLength
+            phrase = " ".join(vocabulary[wordId] for wordId in sequence[position:position + length])
+            if phrase in seenPhrases:
+                continue
+            seenPhrases.add(phrase)
+
+            # Find every verse the passage occurs in from the range of suffixes sharing it
+            first = last = rank[position]
+            while first != 0 and lcpArray[first] >= length:
+                first -= 1
+            while last != len(suffixArray) - 1 and lcpArray[last + 1] >= length:
+                last += 1
+            references = []
+            for i in sorted(suffixArray[first:last + 1]):
+                reference = self.allVerses[verseIndexes[i]][0:3]
+                if reference not in references:
+                    references.append(reference)
+            self.longestRepeats.append([phrase, length, references])
+
+        # Print Minimal Unique Phrases and Longest Repeats if debug enabled
+        if self.debug != "Off" and ("M" in self.debug or "m" in self.debug or self.debug == "On"):
+            print("")
+            print("=== Minimal Unique Phrases (" + str(len(self.minimalUniquePhrases)) + ") ===")
+            for phrase, verse in sorted(self.minimalUniquePhrases.items()):
+                print(phrase + " - " + verse[0] + " " + verse[1] + ":" + verse[2])
+            print("")
+            print("=== Longest Repeats (" + str(len(self.longestRepeats)) + ") ===")
+            for phrase, length, references in self.longestRepeats:
+                print(phrase + " (" + str(length) + ") - " +
+                      "; ".join(verse[0] + " " + verse[1] + ":" + verse[2] for verse in references))
+
+        return 0  # Return with no errors
+
+    def createLists(self):
+        """
+        Function to create all of the lists from the imported verses.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        status = self.createConcordance()
+        if status != 0: return status
+        status = self.createUniqueWords()
+        if status != 0: return status
+        status = self.createTwoWordPhrases()
+        if status != 0: return status
+        status = self.createThreeWordPhrases()
+        if status != 0: return status
+        status = self.createFtvs()
+        if status != 0: return status
+        status = self.createFts()
+        if status != 0: return status
+        status = self.createSits()
+        if status != 0: return status
+        status = self.createNearDuplicates()
+        if status != 0: return status
+        status = self.createSuffixArrayPhrases()
+        if status != 0: return status
+
+        return 0  # Return with no errors
+
+    def createChapterAggregates(self):
+        """
+        Function to create the partial lists of each chapter once, so the lists of any range of chapters can be
+        merged from them without going back through the verses.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        # Group the verses by chapter in the order the chapters first appear
+        chapters = {}
+        for verse in self.allVerses:
+            if (verse[0], verse[1]) in chapters:
+                chapters[(verse[0], verse[1])].append(verse)
+            else:
+                chapters[(verse[0], verse[1])] = [verse]
+
+        # Ranges take their near-duplicates from the whole material, so create them if they have not been yet
+        if not self.nearDuplicatesCreated:
+            status = self.createNearDuplicates()
+            if status != 0: return status
+
+        # Each chapter keeps its verses, concordance, phrase counts and sorted FTV, FT and SIT entries
+        self.chapterAggregates = {}
+        for chapter, verses in chapters.items():
+            chapterLists = ListMaker()
+            chapterLists.allVerses = verses
+            status = chapterLists.createConcordance()
+            if status != 0: return status
+            phraseCounts = {length: self.countPhrases(verses, length) for length in range(1, 4)}
+            self.chapterAggregates[chapter] = [verses, chapterLists.concordance, phraseCounts,
+                                               self.createFtvEntries(verses), self.createFtEntries(verses),
+                                               self.createSitEntries(verses)]
+
+        return 0  # Return with no errors
+
+    def createScopedLists(self, listMaker, chapters):
+        """
+        Function to create the lists for a range of chapters by merging the chapter aggregates of another ListMaker.
+
+        Parameters:
+            listMaker (ListMaker): The ListMaker with all of the material (Its chapter aggregates are created if needed).
+            chapters (array of tuples): The (Book, Chapter) of each chapter in the range in material order.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        if not chapters:
+            return "Error 23 => No chapters in range!!!"
+        if not listMaker.chapterAggregates:
+            status = listMaker.createChapterAggregates()
+            if status != 0: return status
+
+        aggregates = []
+        for chapter in chapters:
+            if chapter not in listMaker.chapterAggregates:
+                return "Error 16 => Chapter not in material!!! " + chapter[0] + " " + chapter[1]
+            aggregates.append(listMaker.chapterAggregates[chapter])
+
+        # Merge the verses and concordance
+        for aggregate in aggregates:
+            self.allVerses += aggregate[0]
+            for word, value in aggregate[1].items():
+                if word in self.concordance:
+                    self.concordance[word][0] += value[0]
+                    self.concordance[word][1] += value[1]
+                else:
+                    self.concordance[word] = [value[0], list(value[1])]
+
+        # Merge the phrase counts, then keep the phrases in a single reference following the same exclusions
+        phraseCounts = self.mergePhraseCounts([aggregate[2] for aggregate in aggregates])
+        for length, counts in phraseCounts.items():
+            self.setPhraseCounts(length, counts)
+        for word, value in phraseCounts[1].items():
+            if value[1].count(value[1][0]) == value[0]:
+                self.uniqueWords[word] = value[1][0]
+        for phrase, value in phraseCounts[2].items():
+            words = phrase.split(" ")
+            if value[1].count(value[1][0]) == value[0] and words[0] not in self.uniqueWords and \
+            words[1] not in self.uniqueWords:
+                self.twoWordPhrases[phrase] = value[1][0]
+        for phrase, value in phraseCounts[3].items():
+            words = phrase.split(" ")
+            if value[1].count(value[1][0]) == value[0] and words[0] not in self.uniqueWords and \
+            words[1] not in self.uniqueWords and words[2] not in self.uniqueWords and \
+            " ".join(words[0:2]) not in self.twoWordPhrases and " ".join(words[1:3]) not in self.twoWordPhrases:
+                self.threeWordPhrases[phrase] = value[1][0]
+
+        # Merge the sorted FTVs, FTs and SITs, copying the entries so each range gets its own unique markers
+        self.ftvs = [list(entry) for entry in heapq.merge(*[aggregate[3] for aggregate in aggregates],
+                                                          key = itemgetter(1, 3, 4, 5))]
+        self.markFirstFiveWords(self.ftvs, " »")
+        self.fts = [list(entry) for entry in heapq.merge(*[aggregate[4] for aggregate in aggregates],
+                                                         key = itemgetter(1, 3, 4, 5))]
+        self.markFirstFiveWords(self.fts, "/")
+        self.sits = list(heapq.merge(*[aggregate[5] for aggregate in aggregates], key = itemgetter(0, 1, 2, 3)))
+
+        # Keep the near-duplicates with both verses in the range
+        for pair in listMaker.nearDuplicates:
+            if (pair[1][0], pair[1][1]) in chapters and (pair[2][0], pair[2][1]) in chapters:
+                self.nearDuplicates.append(pair)
+
+        # Uniqueness of longer phrases depends on the range, so build the suffix array over the range's verses
+        return self.createSuffixArrayPhrases()
+
+    def exportChapterRanges(self, chapterRanges, outputFilename = "Lists_{}-{}.xlsx"):
+        """
+        Function to export the lists of several ranges of chapters, such as the cumulative ranges of a season.
+
+        Parameters:
+            chapterRanges (array of tuples): The first and last chapter of each range, counting the chapters of the
+                material from 1 in the order they appear.
+            outputFilename (str): The output filename with {} for the first and last chapter
+                (Defaults to "Lists_{}-{}.xlsx").
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        if not self.chapterAggregates:
+            status = self.createChapterAggregates()
+            if status != 0: return status
+
+        allChapters = list(self.chapterAggregates)
+        for firstChapter, lastChapter in chapterRanges:
+            if not 1 <= firstChapter <= lastChapter <= len(allChapters):
+                return "Error 17 => Invalid chapter range!!! " + str(firstChapter) + "-" + str(lastChapter)
+
+            lM = ListMaker()
+            status = lM.createScopedLists(self, allChapters[firstChapter - 1:lastChapter])
+            if status != 0: return status
+            status = lM.exportLists(outputFilename.format(firstChapter, lastChapter))
+            if status != 0: return status
+
+        return 0  # Return with no errors
+
     def exportLists(self, outputFilename = "Lists.xlsx"):
         """
         Function to export lists.
@@ -709,6 +1371,56 @@ class ListMaker:
             worksheet.write_rich_string("D" + str(i), *self.boldUniqueWords(phrase, bold))
             i += 1
 
+        ################################################################################################################
+        # Add Minimal Unique Phrases worksheet
+        ################################################################################################################
+        worksheet = workbook.add_worksheet("Minimal Unique Phrases")
+
+        # Add headers
+        worksheet.write("A1", "Book", bold)
+        worksheet.write("B1", "Chapter", bold)
+        worksheet.write("C1", "Verse", bold)
+        worksheet.write("D1", "Phrase", bold)
+        worksheet.write("E1", "Words", bold)
+
+        # Add actual data
+        i = 2
+        for phrase, verse in sorted(self.minimalUniquePhrases.items()):
+            worksheet.write("A" + str(i), verse[0])
+            worksheet.write("B" + str(i), verse[1])
+            worksheet.write("C" + str(i), verse[2])
+            worksheet.write("D" + str(i), phrase)
+            worksheet.write("E" + str(i), len(phrase.split(" ")))
+            i += 1
+
+        ################################################################################################################
+        # Add Frequency worksheets
+        ################################################################################################################
+        for length, count, exactCount in self.frequencyLists:
+            if length == 1:
+                name = "Words"
+            else:
+                name = str(length) + " Word Phrases"
+            worksheet = workbook.add_worksheet(name + (" x" if exactCount else " x1-") + str(count))
+
+            # Add headers
+            worksheet.write("A1", "Book", bold)
+            worksheet.write("B1", "Chapter", bold)
+            worksheet.write("C1", "Verse", bold)
+            worksheet.write("D1", "Phrase", bold)
+            worksheet.write("E1", "Count", bold)
+
+            # Add actual data
+            i = 2
+            for phrase, phraseCount, references in self.getFrequencyList(count, length, exactCount):
+                for reference in references:
+                    worksheet.write("A" + str(i), reference[0])
+                    worksheet.write("B" + str(i), reference[1])
+                    worksheet.write("C" + str(i), reference[2])
+                    worksheet.write("D" + str(i), phrase)
+                    worksheet.write("E" + str(i), phraseCount)
+                    i += 1
+
         ################################################################################################################
         # Add Quotes worksheet
         ################################################################################################################
@@ -793,6 +1505,54 @@ class ListMaker:
             worksheet.write_rich_string("D" + str(i), *self.boldUniqueWords(verse[0], bold))
             i += 1
 
+        ################################################################################################################
+        # Add Near-duplicate Verses worksheet
+        ################################################################################################################
+        worksheet = workbook.add_worksheet("Near-duplicate Verses")
+
+        # Add headers
+        worksheet.write("A1", "Book", bold)
+        worksheet.write("B1", "Chapter", bold)
+        worksheet.write("C1", "Verse", bold)
+        worksheet.write("D1", "Verse Text", bold)
+        worksheet.write("E1", "Similar Book", bold)
+        worksheet.write("F1", "Similar Chapter", bold)
+        worksheet.write("G1", "Similar Verse", bold)
+        worksheet.write("H1", "Similar Verse Text", bold)
+        worksheet.write("I1", "Similarity", bold)
+
+        # Add actual data
+        i = 2
+        for pair in self.nearDuplicates:
+            worksheet.write("A" + str(i), pair[1][0])
+            worksheet.write("B" + str(i), pair[1][1])
+            worksheet.write("C" + str(i), pair[1][2])
+            worksheet.write("D" + str(i), pair[1][3])
+            worksheet.write("E" + str(i), pair[2][0])
+            worksheet.write("F" + str(i), pair[2][1])
+            worksheet.write("G" + str(i), pair[2][2])
+            worksheet.write("H" + str(i), pair[2][3])
+            worksheet.write("I" + str(i), pair[0])
+            i += 1
+
+        ################################################################################################################
+        # Add Longest Repeats worksheet
+        ################################################################################################################
+        worksheet = workbook.add_worksheet("Longest Repeats")
+
+        # Add headers
+        worksheet.write("A1", "Passage", bold)
+        worksheet.write("B1", "Words", bold)
+        worksheet.write("C1", "References", bold)
+
+        # Add actual data
+        i = 2
+        for phrase, length, references in self.longestRepeats:
+            worksheet.write("A" + str(i), phrase)
+            worksheet.write("B" + str(i), length)
+            worksheet.write("C" + str(i), "; ".join(verse[0] + " " + verse[1] + ":" + verse[2] for verse in references))
+            i += 1
+
         try:
             workbook.close()  # Close the workbook
         except IOError:
@@ -813,6 +1573,7 @@ class ListMaker:
         Returns:
             splitVerse(arr): Array of array of str and int representing split verse text.
         """
+        # Material packs store these words, so bump MaterialPack.TOKENIZER_VERSION whenever this changes
         splitVerse = []
         partOfWord = ["", 0]
 
@@ -841,6 +1602,394 @@ class ListMaker:
 
         return splitVerse
 
+    def createFtvEntries(self, verses):
+        """
+        Function to create the sorted FTV entries of verses without their unique markers.
+
+        Parameters:
+            verses (array of verse objects): The verses to create FTVs for.
+
+        Returns:
+            ftvs (array of verse objects): The FTV entries sorted alphabetically.
+        """
+
+        ftvs = []
+        for verse in verses:
+            if not verse[4]:  # Verses without words have nothing to quote
+                continue
+            firstFiveWords = []
+            RestOfVerse = []
+            i = 0
+            for i, word in enumerate(verse[4]):
+                if i > 4:
+                    i -= 1
+                    break
+                else:
+                    firstFiveWords.append(word[0].upper())
+            #for verse in self.allVerses:
+            numOfWords = verse[3].split(" ")
+            NumLen = len(numOfWords)
+            RestOfVerse = ' '.join(numOfWords[5:NumLen + 1])
+            ftvs.append(["", firstFiveWords, i, verse[0], verse[1], verse[2], verse[3], verse[4], RestOfVerse])
+
+        return sorted(ftvs, key = itemgetter(1, 3, 4, 5))
+
+    def createFtEntries(self, verses):
+        """
+        Function to create the sorted FT entries of verses without their unique markers.
+
+        Parameters:
+            verses (array of verse objects): The verses to create FTs for.
+
+        Returns:
+            fts (array of partial verse objects): The FT entries sorted alphabetically.
+        """
+
+        # Group the FT qualifiers by their first character so each verse is scanned only once
+        qualifiers = {}
+        for ftQualifier in self.ftQualifiers:
+            if ftQualifier:
+                qualifiers.setdefault(ftQualifier[0], []).append(ftQualifier)
+
+        # Parse every FT boundary in the verses, reusing the split verse words after the boundary
+        tempFts = []
+        for verse in verses:
+            wordStarts = [word[1] for word in verse[4]]
+            firstWords = set()
+            for start in self.findFtStarts(verse[3], qualifiers):
+                # Overlapping boundaries (Like ". “") start at the same word, so only keep the earliest one
+                firstWord = bisect.bisect_left(wordStarts, start)
+                if firstWord == len(wordStarts) or firstWord in firstWords:
+                    continue
+                firstWords.add(firstWord)
+                splitFt = [[word[0], word[1] - start] for word in verse[4][firstWord:]]
+                tempFts.append([verse[0], verse[1], verse[2], verse[3][start:], splitFt])
+
+        # Add all FTs to FT list
+        fts = []
+        for verse in tempFts:
+            firstFiveWords = []
+            i = 0
+            for i, word in enumerate(verse[4]):
+                if i > 4:
+                    i -= 1
+                    break
+                else:
+                    firstFiveWords.append(word[0].upper())
+            fts.append(["", firstFiveWords, i, verse[0], verse[1], verse[2], verse[3], verse[4]])
+
+        return sorted(fts, key = itemgetter(1, 3, 4, 5))
+
+    def createSitEntries(self, verses):
+        """
+        Function to create the sorted situation entries of verses.
+
+        Parameters:
+            verses (array of verse objects): The verses to find quotations in.
+
+        Returns:
+            sits (array of situation objects): The situation entries sorted alphabetically.
+        """
+
+        sits = []
+        for verse in verses:
+            for i, char in enumerate(verse[3]):
+                if char in ["“", "‘"]:
+                    quotation = verse[3][i:]
+                    if quotation != "":
+                        sits.append([quotation[1:], verse[0], verse[1], verse[2]])
+
+        return sorted(sits, key = itemgetter(0, 1, 2, 3))
+
+    def markFirstFiveWords(self, entries, marker):
+        """
+        Function to set the first five words of sorted FTV or FT entries with a marker after the word that makes
+        them unique from the entries before and after them.
+
+        Parameters:
+            entries (array of verse objects): The FTV or FT entries sorted alphabetically.
+            marker (str): The marker to put after the unique word.
+        """
+
+        currentLine = 0
+        while currentLine != len(entries):
+            uniqueNumber = 0  # A lone entry is unique after its first word
+
+            # Get the unique number based on previous verse
+            if currentLine != 0:
+                word = 0
+                while word != 5 and word <= entries[currentLine][2] and word <= entries[currentLine - 1][2] \
+                    and entries[currentLine][1][word] == entries[currentLine - 1][1][word]:
+                    word += 1
+                uniqueNumber = word
+
+            # Get the unique number based on next verse
+            if currentLine != len(entries) - 1:
+                word = 0
+                while word != 5 and word <= entries[currentLine][2] and word <= entries[currentLine + 1][2] \
+                    and entries[currentLine][1][word] == entries[currentLine + 1][1][word]:
+                    word += 1
+                if uniqueNumber < word:
+                    uniqueNumber = word
+
+            # Make the first five words with unique marker
+            if uniqueNumber >= len(entries[currentLine][1]):  # If verse not unique after 5 words
+                end = entries[currentLine][7][entries[currentLine][2]][1]
+                while end != len(entries[currentLine][6]) and entries[currentLine][6][end] != " ":
+                    end += 1
+                entries[currentLine][0] = "||" + entries[currentLine][6][0:end]
+            else:
+                mid = entries[currentLine][7][uniqueNumber][1] + len(entries[currentLine][7][uniqueNumber][0])
+                while mid != len(entries[currentLine][6]) and entries[currentLine][6][mid] != " ":
+                    mid += 1
+                beforeMarker = entries[currentLine][6][0:mid]
+
+                end = entries[currentLine][7][entries[currentLine][2]][1]
+                while end != len(entries[currentLine][6]) and entries[currentLine][6][end] != " ":
+                    end += 1
+                afterMarker = entries[currentLine][6][mid:end]
+                entries[currentLine][0] = beforeMarker + marker + afterMarker
+
+            currentLine += 1  # Go to next line
+
+    def findFtStarts(self, verseText, qualifiers):
+        """
+        Function to find where every FT starts in a verse in a single pass.
+
+        Parameters:
+            verseText (str): Text of verse to be scanned.
+            qualifiers (dictionary of str arrays): The FT qualifiers grouped by their first character.
+
+        Returns:
+            starts (array of int): The sorted indexes just after every FT qualifier in the verse.
+        """
+
+        starts = []
+        for i, character in enumerate(verseText):
+            if character in qualifiers:
+                for ftQualifier in qualifiers[character]:
+                    if verseText.startswith(ftQualifier, i):
+                        starts.append(i + len(ftQualifier))
+        return sorted(set(starts))
+
+    def countPhrases(self, verses, length):
+        """
+        Function to count every phrase of a number of words within the verses.
+
+        Parameters:
+            verses (array of verse objects): The verses to count phrases in.
+            length (int): The number of words in each phrase.
+
+        Returns:
+            phraseCounts (dictionary of phrase objects): The count and the reference of each occurrence of each
+            uppercase phrase.
+        """
+
+        phraseCounts = {}
+        for verse in verses:
+            reference = verse[0:3]
+            words = [str(word[0]).upper() for word in verse[4]]
+            for i in range(len(words) - length + 1):
+                self.countPhrase(phraseCounts, " ".join(words[i:i + length]), reference)
+        return phraseCounts
+
+    def countPhrase(self, phraseCounts, phrase, reference):
+        """
+        Function to add one occurrence of a phrase to phrase counts.
+
+        Parameters:
+            phraseCounts (dictionary of phrase objects): The count and references of each phrase.
+            phrase (str): The uppercase phrase.
+            reference (array of str): The Book, Chapter and Verse of the occurrence.
+        """
+
+        if phrase in phraseCounts:
+            phraseCounts[phrase][0] += 1
+            phraseCounts[phrase][1].append(reference)
+        else:
+            phraseCounts[phrase] = [1, [reference]]
+
+    def setPhraseCounts(self, length, phraseCounts):
+        """
+        Function to store the phrase counts of a phrase length and group the phrases by how often they occur.
+
+        Parameters:
+            length (int): The number of words in each phrase.
+            phraseCounts (dictionary of phrase objects): The count and references of each phrase.
+        """
+
+        self.phraseCounts[length] = phraseCounts
+        self.phraseBuckets[length] = {}
+        for phrase, value in phraseCounts.items():
+            if value[0] in self.phraseBuckets[length]:
+                self.phraseBuckets[length][value[0]].append(phrase)
+            else:
+                self.phraseBuckets[length][value[0]] = [phrase]
+
+    def mergePhraseCounts(self, allPhraseCounts):
+        """
+        Function to merge the phrase counts of several chapters.
+
+        Parameters:
+            allPhraseCounts (array of dictionaries): The phrase counts of each chapter by phrase length.
+
+        Returns:
+            phraseCounts (dictionary of phrase objects): The merged phrase counts by phrase length.
+        """
+
+        merged = {}
+        for phraseCounts in allPhraseCounts:
+            for length, counts in phraseCounts.items():
+                if length not in merged:
+                    merged[length] = {}
+                for phrase, value in counts.items():
+                    if phrase in merged[length]:
+                        merged[length][phrase][0] += value[0]
+                        merged[length][phrase][1] += value[1]
+                    else:
+                        merged[length][phrase] = [value[0], list(value[1])]
+        return merged
+
+    def buildSuffixArray(self, sequence):
+        """
+        Function to build a suffix array by prefix doubling, stopping as soon as every suffix has its own rank.
+
+        Parameters:
+            sequence (array of int): The sequence to build the suffix array of.
+
+        Returns:
+            suffixArray (array of int): The start of each suffix in sorted order.
+        """
+
+        numSuffixes = len(sequence)
+        if numSuffixes == 0:
+            return []
+        values = {value: i + 1 for i, value in enumerate(sorted(set(sequence)))}
+        rank = [values[value] for value in sequence]
+        suffixArray = list(range(numSuffixes))
+        length = 1
+        while True:
+            # Sort by the rank of the first length items, then by the rank of the next length items
+            keys = [rank[i] * (numSuffixes + 2) + (rank[i + length] if i + length < numSuffixes else 0)
+                    for i in range(numSuffixes)]
+            suffixArray.sort(key = keys.__getitem__)
+
+            newRank = [0] * numSuffixes
+            current = 1
+            for i in range(numSuffixes):
+                if i != 0 and keys[suffixArray[i]] != keys[suffixArray[i - 1]]:
+                    current += 1
+                newRank[suffixArray[i]] = current
+            rank = newRank
+            if current == numSuffixes:
+                return suffixArray
+            length *= 2
+
+    def buildLcpArray(self, sequence, suffixArray):
+        """
+        Function to build the longest common prefix array of a suffix array (Kasai's algorithm).
+
+        Parameters:
+            sequence (array of int): The sequence the suffix array was built from.
+            suffixArray (array of int): The start of each suffix in sorted order.
+
+        Returns:
+            lcpArray (array of int): The length of the prefix each suffix shares with the suffix before it.
+        """
+
+        rank = [0] * len(sequence)
+        for i, position in enumerate(suffixArray):
+            rank[position] = i
+
+        lcpArray = [0] * len(sequence)
+        common = 0
+        for position in range(len(sequence)):
+            if rank[position] == 0:
+                common = 0
+                continue
+            previous = suffixArray[rank[position] - 1]
+            while position + common < len(sequence) and previous + common < len(sequence) and \
+            sequence[position + common] == sequence[previous + common]:
+                common += 1
+            lcpArray[rank[position]] = common
+            if common:
+                common -= 1
+        return lcpArray
+
+    def findLongestRepeated(self, sequenceRefs, suffixArray, lcpArray):
+        """
+        Function to find the longest phrase starting at each position that also occurs in another reference.
+
+        Parameters:
+            sequenceRefs (array of int): The reference ID of each position.
+            suffixArray (array of int): The start of each suffix in sorted order.
+            lcpArray (array of int): The length of the prefix each suffix shares with the suffix before it.
+
+        Returns:
+            longestRepeated (array of int): The longest repeated phrase length starting at each position.
+        """
+
+        # The nearest suffixes from another reference on each side share the longest prefix
+        numSuffixes = len(suffixArray)
+        before = [0] * numSuffixes
+        for i in range(1, numSuffixes):
+            if sequenceRefs[suffixArray[i]] != sequenceRefs[suffixArray[i - 1]]:
+                before[i] = lcpArray[i]
+            else:
+                before[i] = min(before[i - 1], lcpArray[i])
+        after = [0] * numSuffixes
+        for i in range(numSuffixes - 2, -1, -1):
+            if sequenceRefs[suffixArray[i]] != sequenceRefs[suffixArray[i + 1]]:
+                after[i] = lcpArray[i + 1]
+            else:
+                after[i] = min(after[i + 1], lcpArray[i + 1])
+
+        longestRepeated = [0] * numSuffixes
+        for i, position in enumerate(suffixArray):
+            longestRepeated[position] = max(before[i], after[i])
+        return longestRepeated
+
+    def shingleVerse(self, splitVerse, shingleSize):
+        """
+        Function to create the set of word shingles of a split verse.
+
+        Parameters:
+            splitVerse (arr): Array of array of str and int representing split verse text.
+            shingleSize (int): The number of words in each shingle.
+
+        Returns:
+            shingles (set): Set of uppercase shingle strings (The whole verse if shorter than one shingle).
+        """
+
+        words = [word[0].upper() for word in splitVerse]
+        if len(words) < shingleSize:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + shingleSize]) for i in range(len(words) - shingleSize + 1)}
+
+    def getLshBands(self, numHashes, threshold, recall = 0.99):
+        """
+        Function to pick the number of LSH bands and rows per band for a similarity threshold.
+
+        More rows per band means fewer pairs to compare, so this picks the most rows that still make verses at the
+        threshold share a band with a probability of at least recall, which puts the S-curve's midpoint
+        (1 / bands) ^ (1 / rows) well below the threshold.
+
+        Parameters:
+            numHashes (int): The number of MinHash functions in each signature.
+            threshold (float): The similarity threshold the bands should detect.
+            recall (float): The least probability that a pair at the threshold is compared (Defaults to 0.99).
+
+        Returns:
+            (bands, rows) (tuple of int): The number of bands and the rows in each band.
+        """
+
+        best = (numHashes, 1)
+        for rows in range(2, numHashes + 1):
+            bands = numHashes // rows
+            if 1 - (1 - threshold ** rows) ** bands >= recall:
+                best = (bands, rows)
+        return best
+
     def boldUniqueWords(self, myString, boldFormat):
         """
         Function to bold unique words in a particular string.
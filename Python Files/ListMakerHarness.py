@@ -0,0 +1,932 @@
+###################################################################################################
+# Name        : ListMakerHarness.py
+# Author(s)   : Chris Lloyd, Andrew Southwick
+# Description : A differential harness to check list engines against the reference lists
+# Github Link : https://github.com/Clloyd3267/List-Maker/
+###################################################################################################
+
+# External Imports
+from collections import Counter # Used to count the near-duplicate pairs found
+import argparse # Used to read the command line options
+import importlib # Used to load the engine being checked
+import random # Used to generate random material
+import time # Used to time the engines
+import zlib # Used to hash shingles
+from operator import itemgetter # Used for sorting lists
+
+# Internal Imports
+from ListMaker import ListMaker
+
+
+# The lists every engine must produce identically to the reference
+LIST_NAMES = ["allVerses", "concordance", "uniqueWords", "twoWordPhrases", "threeWordPhrases", "ftvs", "fts", "sits",
+              "nearDuplicates", "minimalUniquePhrases", "longestRepeats"]
+
+# Words used to generate material, including the apostrophe, hyphen and quotation edge cases
+WORDS = ["the", "The", "light", "Light", "darkness", "Jesus", "Jesus’", "Jesus'", "God’s", "don’t", "isn't", "son",
+         "well-known", "Spirit-filled", "-", "I", "am", "he", "said", "word", "life", "world", "153", "one", "and",
+         "who", "whoever", "believes", "in", "him", "was", "with", "Very", "truly", "you", "’", "sus’", "Peter"]
+PUNCTUATION = ["", "", "", "", ",", ".", "?", "!", ";", ":", "’", "”", "’”", ".”", "?’", "—"]
+OPENERS = ["", "", "", "", "", "“", "‘", "(", "“‘"]
+
+# The stages each engine is timed by, in the order createLists runs them
+STAGE_NAMES = ["parseVerses", "createConcordance", "createUniqueWords", "createTwoWordPhrases", "createThreeWordPhrases",
+               "createFtvs", "createFts", "createSits", "createNearDuplicates", "createSuffixArrayPhrases"]
+
+# The least share of the near-duplicate pairs found by brute force that every engine must also find
+MINIMUM_RECALL = 0.98
+
+# Hand written material for the rules that random material rarely reaches
+EDGE_CASES = [
+    [],
+    [[None, None, None, None], ["", "", "", ""]],
+    [["Revelation", "22", "21", "Amen."]],
+    [["John", "11", "35", "Jesus wept."], ["John", "11", "36", "“Amen!”"], ["John", "11", "37", "— ‘ ” —"],
+     ["John", "11", "38", "Jesus wept."], ["John", "11", "39", "Amen, amen."]],
+    [["John", "1", "1", "In the beginning was the Word, and the Word was with God."],
+     ["John", "1", "2", "He was with God in the beginning."],
+     ["John", "1", "3", "“In the beginning was the Word,” he said. ‘Who is he?’ I asked; he said nothing!"]],
+    [["John", "11", "35", "Jesus wept, Jesus’ friend wept."],
+     ["John", "11", "36", "Then the Jews said, “See how he loved him!” ‘Jesus’ love!’"],
+     ["John", "11", "37", "But some of them said, “Could not he who opened the eyes of the blind man have kept "
+                          "this man from dying?”"]],
+    [["John", "2", "1", "The well-known wedding - at Cana; the mother of Jesus was there."],
+     [None, None, None, None],
+     ["John", "2", "2", "  Jesus and his disciples had also been invited to the wedding.  "],
+     ["", "", "", ""],
+     ["John", 2, 3, "When the wine was gone, Jesus’s mother said to him, “They have no more wine.”"]],
+    [["John", "3", "16", "For God so loved the world that he gave his one and only Son."],
+     ["John", "3", "17", "For God so loved the world that he gave his one and only Son."],
+     ["John", "3", "18", "For God did not send his Son into the world to condemn the world."]],
+    [["John", "4", "1", "Now Jesus learned that the Pharisees had heard."], ["", "4", "2", "No book here."]],
+    [["John", "4", "1", "Now Jesus learned that the Pharisees had heard."], ["John", "", "2", "No chapter here."]],
+    [["John", "4", "1", "Now Jesus learned that the Pharisees had heard."], ["John", "4", None, "No verse number."]],
+    [["John", "4", "1", "Now Jesus learned that the Pharisees had heard."], ["John", "4", "2", ""]],
+    [["John", "4", "1", "Now Jesus learned that the Pharisees had heard."], ["  ", None, "", None]],
+]
+
+
+class ReferenceListMaker(ListMaker):
+    """
+        A class that freezes the list rules of ListMaker as a reference to check other engines against.
+
+        Optimized engines may replace any of the methods below, so they are copied here as they were when
+        the harness was written. Only change them when a list rule is changed on purpose.
+        """
+
+    def __init__(self):
+        """
+        The constructor for class ReferenceListMaker, pinning the settings the list rules depend on.
+        """
+
+        ListMaker.__init__(self)
+        self.ftQualifiers = [" “", " ‘", ". ", "? ", "! ", "; "]
+        self.nearDuplicateThreshold = 0.6
+        self.minimalPhraseLength = 4
+        self.longestRepeatCount = 100
+
+    def splitVerse(self, verseText):
+        """
+        Frozen copy of ListMaker.splitVerse.
+        """
+        splitVerse = []
+        partOfWord = ["", 0]
+
+        # Loop through all characters with index
+        for i, character in enumerate(verseText):
+            # Character is part of word
+            if (character.isalnum()) or \
+            (character == "-") or \
+            (character in ["’" , "'"] and partOfWord[0] != "" and
+            (i != 0 and (verseText[i - 5:i].lower() == "jesus") or
+            (i != len(verseText) - 1 and i != 0 and verseText[i - 1].isalnum() and verseText[i + 1].isalnum()))):
+                if partOfWord[0] == "":
+                    partOfWord[1] = i
+                partOfWord[0] += character
+
+            # Character is not part of word
+            else:
+                if partOfWord[0]:
+                    splitVerse.append(partOfWord.copy())
+                    partOfWord[0] = ""
+                    partOfWord[1] = 0
+
+        # Append any leftover characters to splitVerse
+        if partOfWord[0]:
+            splitVerse.append(partOfWord.copy())
+
+        return splitVerse
+
+    def createConcordance(self):
+        """
+        Frozen copy of ListMaker.createConcordance.
+        """
+
+        for verse in self.allVerses:
+            for i, word in enumerate(verse[4]):
+                newVerseText = verse[3][0:word[1]] + "◆" + verse[3][word[1] + len(word[0]):]
+                word = str(word[0]).upper()
+
+                if word in self.concordance:
+                    self.concordance[word][1].append([verse[0], verse[1], verse[2], newVerseText])
+                    self.concordance[word][0] += 1
+                else:
+                    self.concordance[word] = [1, [[verse[0], verse[1], verse[2], newVerseText]]]
+
+        return 0 # Return with no errors
+
+    def createUniqueWords(self):
+        """
+        Frozen copy of ListMaker.createUniqueWords.
+        """
+
+        for word, value in sorted(self.concordance.items()):
+            firstOccurence = value[1][0][0:3]
+            uniqueWord = True
+            for occurence in value[1]:
+                if occurence[0:3] != firstOccurence:
+                    uniqueWord = False
+            if uniqueWord:
+                self.uniqueWords[word] = value[1][0][0:3]
+
+        return 0  # Return with no errors
+
+    def createTwoWordPhrases(self):
+        """
+        Frozen copy of ListMaker.createTwoWordPhrases.
+        """
+
+        notUniquePhrases = {}
+        for verse in self.allVerses:
+            i = 0
+            while i < len(verse[4]) - 1:
+                twoWordPhrase = (str(verse[4][i][0]) + " " + str(verse[4][i + 1][0])).upper()
+                if twoWordPhrase not in notUniquePhrases and twoWordPhrase.split()[0].upper() not in \
+                self.uniqueWords and twoWordPhrase.split()[1].upper() not in self.uniqueWords:
+                    if twoWordPhrase in self.twoWordPhrases:
+                        if self.twoWordPhrases[twoWordPhrase] != verse[0:3]:
+                            del self.twoWordPhrases[twoWordPhrase]
+                            notUniquePhrases[twoWordPhrase] = verse[0:3]
+                    else:
+                        self.twoWordPhrases[twoWordPhrase] = verse[0:3]
+                i += 1
+
+        return 0  # Return with no errors
+
+    def createThreeWordPhrases(self):
+        """
+        Frozen copy of ListMaker.createThreeWordPhrases.
+        """
+
+        notUniquePhrases = {}
+        for verse in self.allVerses:
+            i = 0
+            while i < len(verse[4]) - 2:
+                threeWordPhrase = (str(verse[4][i][0]) + " " + str(verse[4][i + 1][0]) + " " +
+                                   str(verse[4][i + 2][0])).upper()
+
+                if threeWordPhrase not in notUniquePhrases and \
+                " ".join(threeWordPhrase.split()[0:2]).upper() not in self.twoWordPhrases and \
+                " ".join(threeWordPhrase.split()[1:3]).upper() not in self.twoWordPhrases and \
+                threeWordPhrase.split()[0].upper() not in self.uniqueWords and \
+                threeWordPhrase.split()[1].upper() not in self.uniqueWords and \
+                threeWordPhrase.split()[2].upper() not in self.uniqueWords:
+                    if threeWordPhrase in self.threeWordPhrases:
+                        if self.threeWordPhrases[threeWordPhrase] != verse[0:3]:
+                            del self.threeWordPhrases[threeWordPhrase]
+                            notUniquePhrases[threeWordPhrase] = verse[0:3]
+                    else:
+                        self.threeWordPhrases[threeWordPhrase] = verse[0:3]
+                i += 1
+
+        return 0  # Return with no errors
+
+    def createFtvs(self):
+        """
+        Frozen copy of ListMaker.createFtvs.
+        """
+
+        # Add all verses to FTV list
+        for verse in self.allVerses:
+            if not verse[4]:  # Verses without words have nothing to quote
+                continue
+            firstFiveWords = []
+            RestOfVerse = []
+            i = 0
+            for i, word in enumerate(verse[4]):
+                if i > 4:
+                    i -= 1
+                    break
+                else:
+                    firstFiveWords.append(word[0].upper())
+            #for verse in self.allVerses:
+            numOfWords = verse[3].split(" ")
+            NumLen = len(numOfWords)
+            RestOfVerse = ' '.join(numOfWords[5:NumLen + 1])
+            self.ftvs.append(["", firstFiveWords, i, verse[0], verse[1], verse[2], verse[3], verse[4], RestOfVerse])
+
+        # Sort the FTV list alphabetically
+        self.ftvs = sorted(self.ftvs, key = itemgetter(1, 3, 4, 5))
+
+        currentLine = 0
+        while currentLine != len(self.ftvs):
+            uniqueNumber = 0  # A lone entry is unique after its first word
+
+            # Get the unique number based on previous verse
+            if currentLine != 0:
+                word = 0
+                while word != 5 and word <= self.ftvs[currentLine][2] and word <= self.ftvs[currentLine - 1][2] \
+                    and self.ftvs[currentLine][1][word] == self.ftvs[currentLine - 1][1][word]:
+                    word += 1
+                uniqueNumber = word
+
+            # Get the unique number based on next verse
+            if currentLine != len(self.ftvs) - 1:
+                word = 0
+                while word != 5 and word <= self.ftvs[currentLine][2] and word <= self.ftvs[currentLine + 1][2] \
+                    and self.ftvs[currentLine][1][word] == self.ftvs[currentLine + 1][1][word]:
+                    word += 1
+                if uniqueNumber < word:
+                    uniqueNumber = word
+
+            # Make the first five words with unique marker
+            if uniqueNumber >= len(self.ftvs[currentLine][1]): # If verse not unique after 5 words
+                end = self.ftvs[currentLine][7][self.ftvs[currentLine][2]][1]
+                while end != len(self.ftvs[currentLine][6]) and self.ftvs[currentLine][6][end] != " ":
+                    end += 1
+                self.ftvs[currentLine][0] = "||" + self.ftvs[currentLine][6][0:end]
+            else:
+                mid = self.ftvs[currentLine][7][uniqueNumber][1] + len(self.ftvs[currentLine][7][uniqueNumber][0])
+                while mid != len(self.ftvs[currentLine][6]) and self.ftvs[currentLine][6][mid] != " ":
+                    mid += 1
+                beforeMarker = self.ftvs[currentLine][6][0:mid]
+
+                end = self.ftvs[currentLine][7][self.ftvs[currentLine][2]][1]
+                while end != len(self.ftvs[currentLine][6]) and self.ftvs[currentLine][6][end] != " ":
+                    end += 1
+                afterMarker = self.ftvs[currentLine][6][mid:end]
+                self.ftvs[currentLine][0] = beforeMarker + " »" + afterMarker
+
+            currentLine += 1 # Go to next line
+
+        return 0  # Return with no errors
+
+    def createFts(self):
+        """
+        Frozen copy of ListMaker.createFts.
+        """
+
+        # Group the FT qualifiers by their first character so each verse is scanned only once
+        qualifiers = {}
+        for ftQualifier in self.ftQualifiers:
+            if ftQualifier:
+                qualifiers.setdefault(ftQualifier[0], []).append(ftQualifier)
+
+        # Parse every FT boundary in the verses, reusing the split verse words after the boundary
+        tempFts = []
+        for verse in self.allVerses:
+            wordsLeft = set()
+            for start in self.findFtStarts(verse[3], qualifiers):
+                # Overlapping boundaries (Like ". “") start at the same word, so only keep the earliest one
+                splitFt = [[word[0], word[1] - start] for word in verse[4] if word[1] >= start]
+                if splitFt and len(splitFt) not in wordsLeft:
+                    wordsLeft.add(len(splitFt))
+                    tempFts.append([verse[0], verse[1], verse[2], verse[3][start:], splitFt])
+
+        # Add all verses to FT list
+        for verse in tempFts:
+            firstFiveWords = []
+            i = 0
+            for i, word in enumerate(verse[4]):
+                if i > 4:
+                    i -= 1
+                    break
+                else:
+                    firstFiveWords.append(word[0].upper())
+            self.fts.append(["", firstFiveWords, i, verse[0], verse[1], verse[2], verse[3], verse[4]])
+
+        # Sort the FT list alphabetically
+        self.fts = sorted(self.fts, key = itemgetter(1, 3, 4, 5))
+
+        currentLine = 0
+        while currentLine != len(self.fts):
+            uniqueNumber = 0  # A lone entry is unique after its first word
+
+            # Get the unique number based on previous verse
+            if currentLine != 0:
+                word = 0
+                while word != 5 and word <= self.fts[currentLine][2] and word <= self.fts[currentLine - 1][2] \
+                    and self.fts[currentLine][1][word] == self.fts[currentLine - 1][1][word]:
+                    word += 1
+                uniqueNumber = word
+
+            # Get the unique number based on next verse
+            if currentLine != len(self.fts) - 1:
+                word = 0
+                while word != 5 and word <= self.fts[currentLine][2] and word <= self.fts[currentLine + 1][2] \
+                    and self.fts[currentLine][1][word] == self.fts[currentLine + 1][1][word]:
+                    word += 1
+                if uniqueNumber < word:
+                    uniqueNumber = word
+
+            # Make the first five words with unique marker
+            if uniqueNumber >= len(self.fts[currentLine][1]):  # If verse not unique after 5 words
+                end = self.fts[currentLine][7][self.fts[currentLine][2]][1]
+                while end != len(self.fts[currentLine][6]) and self.fts[currentLine][6][end] != " ":
+                    end += 1
+                self.fts[currentLine][0] = "||" + self.fts[currentLine][6][0:end]
+            else:
+                mid = self.fts[currentLine][7][uniqueNumber][1] + len(self.fts[currentLine][7][uniqueNumber][0])
+                while mid != len(self.fts[currentLine][6]) and self.fts[currentLine][6][mid] != " ":
+                    mid += 1
+                beforeMarker = self.fts[currentLine][6][0:mid]
+
+                end = self.fts[currentLine][7][self.fts[currentLine][2]][1]
+                while end != len(self.fts[currentLine][6]) and self.fts[currentLine][6][end] != " ":
+                    end += 1
+                afterMarker = self.fts[currentLine][6][mid:end]
+                self.fts[currentLine][0] = beforeMarker + "/" + afterMarker
+
+            currentLine += 1  # Go to next line
+
+        return 0  # Return with no errors
+
+    def findFtStarts(self, verseText, qualifiers):
+        """
+        Frozen copy of ListMaker.findFtStarts.
+        """
+
+        starts = []
+        for i, character in enumerate(verseText):
+            if character in qualifiers:
+                for ftQualifier in qualifiers[character]:
+                    if verseText.startswith(ftQualifier, i):
+                        starts.append(i + len(ftQualifier))
+        return sorted(set(starts))
+
+    def createSits(self):
+        """
+        Frozen copy of ListMaker.createSits.
+        """
+
+        for verse in self.allVerses:
+            for i, char in enumerate(verse[3]):
+                if char in ["“", "‘"]:
+                    quotation = verse[3][i:]
+                    if quotation != "":
+                        self.sits.append([quotation[1:], verse[0], verse[1], verse[2]])
+
+        # Sort Sits alphabetically
+        self.sits = sorted(self.sits, key = itemgetter(0, 1, 2, 3))
+
+        return 0  # Return with no errors
+
+    def parseVerses(self, rows, splitVerses = None):
+        """
+        Frozen copy of ListMaker.parseVerses.
+        """
+
+        for row in rows:
+            # Check to make sure verse is valid
+            verse = []
+            valid = False
+
+            for value in row:
+                if not value:
+                    verse.append("")
+                else:
+                    verse.append(str(value).strip())
+                    valid = True
+
+            if not valid:
+                continue
+            if not verse[0]:
+                return "Error 2 => No Book!!! " + verse[0] + " " + verse[1] + ":" + verse[2] + " " + verse[3]
+            if not verse[1]:
+                return "Error 3 => No Chapter!!! " + verse[0] + " " + verse[1] + ":" + verse[2] + " " + verse[3]
+            if not verse[2]:
+                return "Error 4 => No Verse Number!!! " + verse[0] + " " + verse[1] + ":" + verse[2] + " " + verse[3]
+            if not verse[3]:
+                return "Error 5 => No Verse!!! " + verse[0] + " " + verse[1] + ":" + verse[2] + " " + verse[3]
+
+            # Split verse
+            verse.append(self.splitVerse(verse[3]))
+
+            # Add verse to list of all verses
+            self.allVerses.append(verse)
+
+        # Add verses that were already checked and split
+        if splitVerses:
+            self.allVerses += splitVerses
+
+        return 0 # Return with no errors
+
+    def createLists(self):
+        """
+        Frozen copy of ListMaker.createLists.
+        """
+
+        status = self.createConcordance()
+        if status != 0: return status
+        status = self.createUniqueWords()
+        if status != 0: return status
+        status = self.createTwoWordPhrases()
+        if status != 0: return status
+        status = self.createThreeWordPhrases()
+        if status != 0: return status
+        status = self.createFtvs()
+        if status != 0: return status
+        status = self.createFts()
+        if status != 0: return status
+        status = self.createSits()
+        if status != 0: return status
+        status = self.createNearDuplicates()
+        if status != 0: return status
+        status = self.createSuffixArrayPhrases()
+        if status != 0: return status
+
+        return 0  # Return with no errors
+
+    def createNearDuplicates(self, numHashes = 64, shingleSize = 2):
+        """
+        Frozen copy of ListMaker.createNearDuplicates.
+        """
+
+        if not 0 < self.nearDuplicateThreshold <= 1:
+            return "Error 8 => Near-duplicate threshold must be between 0 and 1!!!"
+
+        # Create the MinHash functions (a * x + b) mod p with a fixed seed so results are repeatable
+        prime = (1 << 61) - 1
+        generator = random.Random(3267)
+        hashFuncs = [(generator.randrange(1, prime), generator.randrange(0, prime)) for _ in range(numHashes)]
+        bands, rows = self.getLshBands(numHashes, self.nearDuplicateThreshold)
+
+        # Create the shingle set and MinHash signature of every verse
+        shingleHashes = {} # Cache of the hashed values of each distinct shingle
+        allShingles = []
+        buckets = {}
+        for verseIndex, verse in enumerate(self.allVerses):
+            shingles = self.shingleVerse(verse[4], shingleSize)
+            allShingles.append(shingles)
+            if not shingles:
+                continue
+
+            values = []
+            for shingle in shingles:
+                if shingle not in shingleHashes:
+                    x = zlib.crc32(shingle.encode("utf-8"))
+                    shingleHashes[shingle] = tuple((a * x + b) % prime for a, b in hashFuncs)
+                values.append(shingleHashes[shingle])
+            signature = tuple(map(min, zip(*values)))
+
+            # Add the verse to one bucket per band of its signature
+            for band in range(bands):
+                key = (band, signature[band * rows:(band + 1) * rows])
+                if key in buckets:
+                    buckets[key].append(verseIndex)
+                else:
+                    buckets[key] = [verseIndex]
+
+        # Check the candidate pairs that share a bucket
+        checkedPairs = set()
+        for bucket in buckets.values():
+            for i, first in enumerate(bucket):
+                for second in bucket[i + 1:]:
+                    if (first, second) in checkedPairs:
+                        continue
+                    checkedPairs.add((first, second))
+
+                    similarity = len(allShingles[first] & allShingles[second]) / \
+                                 len(allShingles[first] | allShingles[second])
+                    if similarity >= self.nearDuplicateThreshold:
+                        self.nearDuplicates.append([round(similarity, 3), self.allVerses[first][0:4],
+                                                    self.allVerses[second][0:4]])
+
+        # Sort the near-duplicates by most similar first
+        self.nearDuplicates = sorted(self.nearDuplicates, key = lambda pair: (-pair[0], pair[1], pair[2]))
+
+        return 0  # Return with no errors
+
+    def createSuffixArrayPhrases(self):
+        """
+        Frozen copy of ListMaker.createSuffixArrayPhrases.
+        """
+
+        if not self.allVerses:
+            return 0  # Return with no errors
+
+        # Create the word ID sequence with a different sentinel after each verse so no phrase crosses verses
+        wordIds = {}
+        referenceIds = {}
+        sequence = []
+        sequenceRefs = []
+        verseEnds = []
+        for verseIndex, verse in enumerate(self.allVerses):
+            referenceId = referenceIds.setdefault((verse[0], verse[1], verse[2]), len(referenceIds))
+            for word in verse[4]:
+                sequence.append(wordIds.setdefault(str(word[0]).upper(), len(wordIds)))
+                sequenceRefs.append(referenceId)
+            sequence.append(-1 - verseIndex)
+            sequenceRefs.append(referenceId)
+            verseEnds.extend([len(sequence) - 1] * (len(verse[4]) + 1))
+
+        suffixArray = self.buildSuffixArray(sequence)
+        lcpArray = self.buildLcpArray(sequence, suffixArray)
+        longestRepeated = self.findLongestRepeated(sequenceRefs, suffixArray, lcpArray)
+        vocabulary = list(wordIds)
+        verseIndexes = [verseIndex for verseIndex, verse in enumerate(self.allVerses) for _ in range(len(verse[4]) + 1)]
+
+        # The shortest unique phrase starting at each word is one word longer than its longest repeat, and it is
+        # minimal when the shortest unique phrase starting at the next word ends after it
+        for position, repeated in enumerate(longestRepeated):
+            length = repeated + 1
+            if sequence[position] < 0 or length < self.minimalPhraseLength or position + length > verseEnds[position]:
+                continue
+            if position + 1 + longestRepeated[position + 1] + 1 <= position + length:
+                continue
+            phrase = " ".join(vocabulary[wordId] for wordId in sequence[position:position + length])
+            self.minimalUniquePhrases[phrase] = self.allVerses[verseIndexes[position]][0:3]
+
+        # Keep the longest repeated passages that are not part of the passage repeated from the word before
+        candidates = []
+        for position, repeated in enumerate(longestRepeated):
+            if repeated == 0 or (position != 0 and sequence[position - 1] >= 0 and
+                                 longestRepeated[position - 1] > repeated):
+                continue
+            candidates.append((-repeated, position))
+        candidates.sort()
+
+        rank = [0] * len(suffixArray)
+        for i, position in enumerate(suffixArray):
+            rank[position] = i
+        seenPhrases = set()
+        for negativeLength, position in candidates:
+            if len(self.longestRepeats) == self.longestRepeatCount:
+                break
+            length = -negativeLength
+            phrase = " ".join(vocabulary[wordId] for wordId in sequence[position:position + length])
+            if phrase in seenPhrases:
+                continue
+            seenPhrases.add(phrase)
+
+            # Find every verse the passage occurs in from the range of suffixes sharing it
+            first = last = rank[position]
+            while first != 0 and lcpArray[first] >= length:
+                first -= 1
+            while last != len(suffixArray) - 1 and lcpArray[last + 1] >= length:
+                last += 1
+            references = []
+            for i in sorted(suffixArray[first:last + 1]):
+                reference = self.allVerses[verseIndexes[i]][0:3]
+                if reference not in references:
+                    references.append(reference)
+            self.longestRepeats.append([phrase, length, references])
+
+        return 0  # Return with no errors
+
+    def shingleVerse(self, splitVerse, shingleSize):
+        """
+        Frozen copy of ListMaker.shingleVerse.
+        """
+
+        words = [word[0].upper() for word in splitVerse]
+        if len(words) < shingleSize:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + shingleSize]) for i in range(len(words) - shingleSize + 1)}
+
+    def getLshBands(self, numHashes, threshold, recall = 0.99):
+        """
+        Frozen copy of ListMaker.getLshBands.
+        """
+
+        best = (numHashes, 1)
+        for rows in range(2, numHashes + 1):
+            bands = numHashes // rows
+            if 1 - (1 - threshold ** rows) ** bands >= recall:
+                best = (bands, rows)
+        return best
+
+    def buildSuffixArray(self, sequence):
+        """
+        Frozen copy of ListMaker.buildSuffixArray.
+        """
+
+        numSuffixes = len(sequence)
+        if numSuffixes == 0:
+            return []
+        values = {value: i + 1 for i, value in enumerate(sorted(set(sequence)))}
+        rank = [values[value] for value in sequence]
+        suffixArray = list(range(numSuffixes))
+        length = 1
+        while True:
+            # Sort by the rank of the first length items, then by the rank of the next length items
+            keys = [rank[i] * (numSuffixes + 2) + (rank[i + length] if i + length < numSuffixes else 0)
+                    for i in range(numSuffixes)]
+            suffixArray.sort(key = keys.__getitem__)
+
+            newRank = [0] * numSuffixes
+            current = 1
+            for i in range(numSuffixes):
+                if i != 0 and keys[suffixArray[i]] != keys[suffixArray[i - 1]]:
+                    current += 1
+                newRank[suffixArray[i]] = current
+            rank = newRank
+            if current == numSuffixes:
+                return suffixArray
+            length *= 2
+
+    def buildLcpArray(self, sequence, suffixArray):
+        """
+        Frozen copy of ListMaker.buildLcpArray.
+        """
+
+        rank = [0] * len(sequence)
+        for i, position in enumerate(suffixArray):
+            rank[position] = i
+
+        lcpArray = [0] * len(sequence)
+        common = 0
+        for position in range(len(sequence)):
+            if rank[position] == 0:
+                common = 0
+                continue
+            previous = suffixArray[rank[position] - 1]
+            while position + common < len(sequence) and previous + common < len(sequence) and \
+            sequence[position + common] == sequence[previous + common]:
+                common += 1
+            lcpArray[rank[position]] = common
+            if common:
+                common -= 1
+        return lcpArray
+
+    def findLongestRepeated(self, sequenceRefs, suffixArray, lcpArray):
+        """
+        Frozen copy of ListMaker.findLongestRepeated.
+        """
+
+        # The nearest suffixes from another reference on each side share the longest prefix
+        numSuffixes = len(suffixArray)
+        before = [0] * numSuffixes
+        for i in range(1, numSuffixes):
+            if sequenceRefs[suffixArray[i]] != sequenceRefs[suffixArray[i - 1]]:
+                before[i] = lcpArray[i]
+            else:
+                before[i] = min(before[i - 1], lcpArray[i])
+        after = [0] * numSuffixes
+        for i in range(numSuffixes - 2, -1, -1):
+            if sequenceRefs[suffixArray[i]] != sequenceRefs[suffixArray[i + 1]]:
+                after[i] = lcpArray[i + 1]
+            else:
+                after[i] = min(after[i + 1], lcpArray[i + 1])
+
+        longestRepeated = [0] * numSuffixes
+        for i, position in enumerate(suffixArray):
+            longestRepeated[position] = max(before[i], after[i])
+        return longestRepeated
+
+
+def generateMaterial(generator, numVerses):
+    """
+    Function to generate random rows of verse cells.
+
+    Parameters:
+        generator (random.Random): The random generator to use.
+        numVerses (int): The number of rows to generate.
+
+    Returns:
+        rows (array of arrays): The Book, Chapter, Verse and Verse Text cell values of each row.
+    """
+
+    reference = ReferenceListMaker()
+    rows = []
+    book, chapter, verse = "John", 1, 0
+    for _ in range(numVerses):
+        # Move to the next verse, sometimes the next chapter or book, and sometimes repeat a reference
+        if generator.random() < 0.1:
+            chapter, verse = chapter + 1, 0
+        if generator.random() < 0.02:
+            book, chapter, verse = generator.choice(["Jude", "Acts", "1 John"]), 1, 0
+        if generator.random() > 0.01:
+            verse += 1
+
+        # Add some empty rows
+        if generator.random() < 0.02:
+            rows.append(generator.choice([[None, None, None, None], ["", "", "", ""], [None, "", 0, None]]))
+
+        # Build the verse text from at least three split words so every list rule applies
+        words = []
+        while len(reference.splitVerse(" ".join(words))) < 3:
+            if generator.random() < 0.3:
+                word = "".join(generator.choice("abcdefgh") for _ in range(generator.randint(1, 4)))
+            else:
+                word = generator.choice(WORDS)
+            words.append(generator.choice(OPENERS) + word + generator.choice(PUNCTUATION))
+            if len(words) == 3:
+                words += [generator.choice(WORDS) for _ in range(generator.randint(0, 22))]
+        verseText = " ".join(words)
+        if generator.random() < 0.05:
+            verseText = "  " + verseText + " "
+        rows.append([book, str(chapter), str(verse), verseText])
+
+    return rows
+
+
+def generateNearDuplicateMaterial(generator, numVerses):
+    """
+    Function to generate random rows of verse cells where half of the verses are copies of others with a few
+    words changed.
+
+    Parameters:
+        generator (random.Random): The random generator to use.
+        numVerses (int): The number of rows to generate.
+
+    Returns:
+        rows (array of arrays): The Book, Chapter, Verse and Verse Text cell values of each row.
+    """
+
+    rows = generateMaterial(generator, numVerses - numVerses // 2)
+    originals = [row for row in rows if row[3]]
+    for verse in range(1, numVerses // 2 + 1):
+        words = generator.choice(originals)[3].split()
+        for _ in range(generator.randint(1, max(1, len(words) // 5))):
+            words[generator.randrange(len(words))] = generator.choice(WORDS)
+        rows.append(["Acts", "28", str(verse), " ".join(words)])
+
+    return rows
+
+
+def runEngine(engineClass, rows):
+    """
+    Function to import rows into an engine and create all of the lists.
+
+    Parameters:
+        engineClass (class): The ListMaker class to run.
+        rows (array of arrays): The Book, Chapter, Verse and Verse Text cell values of each row.
+
+    Returns:
+        (engine, status, stageTimes) (tuple): The engine, its status or exception name and the time taken by each
+        stage and in total.
+    """
+
+    engine = engineClass()
+    stageTimes = dict.fromkeys(STAGE_NAMES + ["Total"], 0)
+
+    # Wrap each stage of this engine so the time spent in it is added up
+    def timeStage(name, stage):
+        def timedStage(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return stage(*args, **kwargs)
+            finally:
+                stageTimes[name] += time.perf_counter() - start_time
+        return timedStage
+    for name in STAGE_NAMES:
+        setattr(engine, name, timeStage(name, getattr(engine, name)))
+
+    start_time = time.perf_counter()
+    try:
+        status = engine.parseVerses(rows)
+        if status == 0:
+            status = engine.createLists()
+    except Exception as error:
+        status = "Exception => " + type(error).__name__
+    stageTimes["Total"] = time.perf_counter() - start_time
+    return engine, status, stageTimes
+
+
+def compareEngines(engineClass, rows, referenceClass = ReferenceListMaker):
+    """
+    Function to check that an engine creates exactly the same lists as the reference.
+
+    Parameters:
+        engineClass (class): The ListMaker class to check.
+        rows (array of arrays): The Book, Chapter, Verse and Verse Text cell values of each row.
+        referenceClass (class): The ListMaker class to check against (Defaults to ReferenceListMaker).
+
+    Returns:
+        (differences, referenceTimes, engineTimes, engine) (tuple): Descriptions of every difference, the times
+        taken by each stage and the engine.
+    """
+
+    reference, referenceStatus, referenceTimes = runEngine(referenceClass, rows)
+    engine, engineStatus, engineTimes = runEngine(engineClass, rows)
+
+    differences = []
+    if referenceStatus != engineStatus:
+        differences.append("status: " + repr(referenceStatus) + " != " + repr(engineStatus))
+    for name in LIST_NAMES:
+        expected = getattr(reference, name)
+        actual = getattr(engine, name)
+        if expected == actual:
+            continue
+        if isinstance(expected, dict):
+            for key in sorted(set(expected) | set(actual)):
+                if expected.get(key) != actual.get(key):
+                    differences.append(name + "[" + repr(key) + "]: " + repr(expected.get(key))[:200] + " != " +
+                                       repr(actual.get(key))[:200])
+                    break
+        else:
+            for i in range(max(len(expected), len(actual))):
+                if i >= len(expected) or i >= len(actual) or expected[i] != actual[i]:
+                    differences.append(name + "[" + str(i) + "]: " +
+                                       (repr(expected[i])[:200] if i < len(expected) else "missing") + " != " +
+                                       (repr(actual[i])[:200] if i < len(actual) else "missing"))
+                    break
+
+    return differences, referenceTimes, engineTimes, engine
+
+
+def findNearDuplicatePairs(listMaker):
+    """
+    Function to find the near-duplicate verses of a ListMaker by comparing every pair of verses.
+
+    Parameters:
+        listMaker (ListMaker): The ListMaker with the verses and threshold.
+
+    Returns:
+        pairs (Counter of tuples): The number of times each pair of verses (Book, Chapter, Verse and Verse Text)
+        is at least as similar as the threshold.
+    """
+
+    verses = [tuple(verse[0:4]) for verse in listMaker.allVerses]
+    allShingles = [ReferenceListMaker.shingleVerse(listMaker, verse[4], 2) for verse in listMaker.allVerses]
+    pairs = Counter()
+    for first in range(len(verses)):
+        for second in range(first + 1, len(verses)):
+            if allShingles[first] and allShingles[second] and \
+            len(allShingles[first] & allShingles[second]) >= \
+            listMaker.nearDuplicateThreshold * len(allShingles[first] | allShingles[second]):
+                pairs[(verses[first], verses[second])] += 1
+    return pairs
+
+
+def runHarness(engineClass, trials = 50, numVerses = 200, seed = 3267):
+    """
+    Function to check an engine against the reference on the edge cases and random material.
+
+    Parameters:
+        engineClass (class): The ListMaker class to check.
+        trials (int): The number of random materials to check (Defaults to 50).
+        numVerses (int): The number of rows in each random material (Defaults to 200).
+        seed (int): The seed for the random material (Defaults to 3267).
+
+    Returns:
+        (0): No errors, (Anything else): Errors.
+    """
+
+    generator = random.Random(seed)
+    materials = [("Edge case " + str(i + 1), rows) for i, rows in enumerate(EDGE_CASES)]
+    materials += [("Random " + str(i + 1), generateMaterial(generator, numVerses)) for i in range(trials)]
+    materials += [("Near-duplicates " + str(i + 1), generateNearDuplicateMaterial(generator, numVerses))
+                  for i in range(trials // 5 + 1)]
+
+    failures = 0
+    referenceTimes = dict.fromkeys(STAGE_NAMES + ["Total"], 0)
+    engineTimes = dict.fromkeys(STAGE_NAMES + ["Total"], 0)
+    expectedPairs = 0
+    foundPairs = 0
+    for name, rows in materials:
+        differences, materialReferenceTimes, materialEngineTimes, engine = compareEngines(engineClass, rows)
+        for name in referenceTimes:
+            referenceTimes[name] += materialReferenceTimes[name]
+            engineTimes[name] += materialEngineTimes[name]
+
+        # Check the near-duplicates found against every pair, as LSH may miss pairs without any difference
+        if engine.allVerses and not differences:
+            expected = findNearDuplicatePairs(engine)
+            found = Counter((tuple(pair[1]), tuple(pair[2])) for pair in engine.nearDuplicates)
+            expectedPairs += sum(expected.values())
+            foundPairs += sum((expected & found).values())
+        if differences:
+            failures += 1
+            print(name + " => FAILED")
+            for difference in differences:
+                print("    " + difference)
+
+    print("Checked " + engineClass.__name__ + " on " + str(len(materials)) + " materials, " + str(failures) +
+          " failed.")
+    recall = foundPairs / expectedPairs if expectedPairs else 1
+    print("Near-duplicate recall: {} of {} pairs ({:.1%})".format(foundPairs, expectedPairs, recall))
+    print("{:<26}{:>12}{:>18}{:>10}".format("Stage", "Reference", engineClass.__name__, "Speedup"))
+    for name in STAGE_NAMES + ["Total"]:
+        print("{:<26}{:>11.3f}s{:>17.3f}s{:>9.2f}x".format(name, referenceTimes[name], engineTimes[name],
+                                                          referenceTimes[name] / max(engineTimes[name], 1e-9)))
+
+    if failures:
+        return "Error 13 => " + str(failures) + " materials differ from the reference!!!"
+    if recall < MINIMUM_RECALL:
+        return "Error 22 => Near-duplicate recall is below {:.0%}!!!".format(MINIMUM_RECALL)
+    return 0  # Return with no errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Check a list engine against the reference lists.")
+    parser.add_argument("--engine", default = "ListMaker:ListMaker", help = "The engine to check as module:Class")
+    parser.add_argument("--trials", type = int, default = 50, help = "The number of random materials to check")
+    parser.add_argument("--verses", type = int, default = 200, help = "The number of verses in each random material")
+    parser.add_argument("--seed", type = int, default = 3267, help = "The seed for the random material")
+    args = parser.parse_args()
+
+    moduleName, className = args.engine.split(":")
+    status = runHarness(getattr(importlib.import_module(moduleName), className), args.trials, args.verses, args.seed)
+    if status != 0: print(status)
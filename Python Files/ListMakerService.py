@@ -0,0 +1,337 @@
+###################################################################################################
+# Name        : ListMakerService.py
+# Author(s)   : Chris Lloyd, Andrew Southwick
+# Description : A local service that keeps the material and lists in memory
+# Github Link : https://github.com/Clloyd3267/List-Maker/
+###################################################################################################
+
+# External Imports
+from pathlib import Path # Used for file manipulation
+import argparse # Used to read the command line options
+import json # Used to encode requests and responses
+import os # Used to check when the material file changes
+import socketserver # Used to serve requests
+import threading # Used to lock the lists while reloading
+import time # Used to time reloads
+
+# Internal Imports
+from ListMaker import ListMaker
+
+
+class ListMakerService:
+    """
+        A class to keep a ListMaker resident in memory and answer list and lookup requests.
+
+        Requests and responses are single lines of JSON. Every request has a "command" key and every
+        response has a "status" key of 0 for no errors or the error string.
+
+        Attributes:
+            versesFileName (str): The input filename for verse list.
+            listMaker (ListMaker): The ListMaker holding the current lists.
+            lookups (dictionary of lookups): The FTV entry and the verses of each reference in the current lists.
+            modifiedTime (float): The modified time of the input file when it was last loaded.
+            failedTime (float): The modified time of the input file when it last failed to load.
+            lock (threading.Lock): A lock so requests never see a half loaded ListMaker.
+            reloadLock (threading.RLock): A lock so only one request at a time reloads the material.
+        """
+
+    def __init__(self, versesFileName):
+        """
+        The constructor for class ListMakerService.
+
+        Parameters:
+            versesFileName (str): The input filename for verse list.
+        """
+
+        self.versesFileName = versesFileName
+        self.listMaker = None
+        self.lookups = {}
+        self.modifiedTime = None
+        self.failedTime = None
+        self.lock = threading.Lock()
+        self.reloadLock = threading.RLock()
+
+    def loadMaterial(self):
+        """
+        Function to import the verses into a new ListMaker and create all of the lists.
+
+        If the material can not be loaded (For example while it is still being saved) the current lists are kept.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        with self.reloadLock:
+            start_time = time.time()
+            try:
+                modifiedTime = os.path.getmtime(self.versesFileName)
+            except OSError:
+                return "Error 1 => Verses file does not exist!!!"
+
+            # Close the current pack so the new one can replace it, the current lists stay in memory until the swap
+            with self.lock:
+                if self.listMaker is not None:
+                    self.listMaker.closeMaterial()
+
+            lM = ListMaker()
+            try:
+                status = lM.importPackedVerses(self.versesFileName)
+                if status == 0:
+                    status = lM.createLists()
+            except Exception as error:
+                status = "Error 20 => Material could not be loaded!!! " + repr(error)
+            if status != 0:
+                self.failedTime = modifiedTime
+                return status
+            lookups = self.createLookups(lM)
+
+            # Only swap in the new lists once they are complete
+            with self.lock:
+                self.listMaker = lM
+                self.lookups = lookups
+                self.modifiedTime = modifiedTime
+            print("Loaded " + str(self.versesFileName) + " in: {:.2f}s".format(time.time() - start_time))
+
+        return 0  # Return with no errors
+
+    def createLookups(self, listMaker):
+        """
+        Function to index the lists by reference so lookups do not scan them.
+
+        Parameters:
+            listMaker (ListMaker): The ListMaker with the lists to index.
+
+        Returns:
+            lookups (dictionary of lookups): The FTV entry and the verses of each (Book, Chapter, Verse).
+        """
+
+        ftvs = {}
+        for entry in listMaker.ftvs:
+            ftvs.setdefault(tuple(entry[3:6]), entry)
+        verses = {}
+        for verse in listMaker.allVerses:
+            verses.setdefault(tuple(verse[0:3]), []).append(verse)
+        return {"ftvs": ftvs, "verses": verses}
+
+    def findOccurrences(self, listMaker, lookups, words):
+        """
+        Function to find the count and references of every occurrence of a phrase.
+
+        Parameters:
+            listMaker (ListMaker): The ListMaker with the lists.
+            lookups (dictionary of lookups): The lookups of the ListMaker from createLookups.
+            words (array of str): The uppercase words of the phrase.
+
+        Returns:
+            occurrences (phrase object): The count and the reference of each occurrence of the phrase.
+        """
+
+        phrase = " ".join(words)
+        phraseCounts = listMaker.phraseCounts.get(len(words))
+        if phraseCounts is not None:
+            return phraseCounts.get(phrase, [0, []])
+
+        # Only count phrases in the verses that have the rarest word of the phrase
+        for word in words:
+            if word not in listMaker.concordance:
+                return [0, []]
+        rarestWord = min(words, key = lambda word: listMaker.concordance[word][0])
+        references = dict.fromkeys(tuple(occurrence[0:3]) for occurrence in listMaker.concordance[rarestWord][1])
+        verses = [verse for reference in references for verse in lookups["verses"][reference]]
+        return listMaker.countPhrases(verses, len(words)).get(phrase, [0, []])
+
+    def checkReload(self):
+        """
+        Function to reload the material if the input file has changed since it was last loaded.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        try:
+            modifiedTime = os.path.getmtime(self.versesFileName)
+        except OSError:
+            modifiedTime = None
+        if modifiedTime in [self.modifiedTime, self.failedTime]:
+            return 0  # Return with no errors
+
+        # Only one request reloads, the others keep answering from the current lists in the meantime
+        if not self.reloadLock.acquire(blocking = self.listMaker is None):
+            return 0  # Return with no errors
+        try:
+            status = self.loadMaterial()
+        finally:
+            self.reloadLock.release()
+
+        # Keep answering from the current lists until the material loads again
+        if status != 0 and self.listMaker is not None:
+            print(status)
+            return 0  # Return with no errors
+        return status
+
+    def handleRequest(self, request):
+        """
+        Function to answer a single request.
+
+        Parameters:
+            request (dict): The decoded request with a "command" key.
+
+        Returns:
+            response (dict): The response with a "status" key and any results.
+        """
+
+        if not isinstance(request, dict):
+            return {"status": "Error 19 => Request must be a JSON object!!!"}
+
+        command = request.get("command")
+        if command == "reload":
+            return {"status": self.loadMaterial()}
+
+        status = self.checkReload()
+        if status != 0:
+            return {"status": status}
+
+        with self.lock:
+            lM = self.listMaker
+            lookups = self.lookups
+
+        lists = {"verses": lM.allVerses, "concordance": lM.concordance, "uniqueWords": lM.uniqueWords,
+                 "twoWordPhrases": lM.twoWordPhrases, "threeWordPhrases": lM.threeWordPhrases, "ftvs": lM.ftvs,
+                 "fts": lM.fts, "sits": lM.sits, "nearDuplicates": lM.nearDuplicates,
+                 "minimalUniquePhrases": lM.minimalUniquePhrases, "longestRepeats": lM.longestRepeats}
+
+        if command == "lists":
+            return {"status": 0, "lists": sorted(lists)}
+
+        elif command == "list":
+            if not isinstance(request.get("name"), str) or request["name"] not in lists:
+                return {"status": "Error 10 => Unknown list!!! " + str(request.get("name"))}
+            return {"status": 0, "list": lists[request["name"]]}
+
+        elif command == "concordance":
+            word = str(request.get("word", "")).upper()
+            if word not in lM.concordance:
+                return {"status": 0, "count": 0, "occurrences": []}
+            return {"status": 0, "count": lM.concordance[word][0], "occurrences": lM.concordance[word][1]}
+
+        elif command == "ftv":
+            reference = (str(request.get("book", "")), str(request.get("chapter", "")), str(request.get("verse", "")))
+            if reference not in lookups["ftvs"]:
+                return {"status": "Error 11 => Unknown reference!!! " + " ".join(reference)}
+            verse = lookups["ftvs"][reference]
+            return {"status": 0, "ftv": verse[0], "rest": verse[8]}
+
+        elif command == "unique":
+            # A phrase is unique when every occurrence of it is in the same reference
+            words = [str(word[0]).upper() for word in lM.splitVerse(str(request.get("phrase", "")))]
+            count, references = self.findOccurrences(lM, lookups, words) if words else [0, []]
+            unique = count != 0 and references.count(references[0]) == count
+            return {"status": 0, "phrase": " ".join(words), "unique": unique, "count": count,
+                    "reference": references[0][0:3] if unique else None}
+
+        elif command == "frequency":
+            try:
+                count = int(request.get("count", 1))
+                length = int(request.get("length", 1))
+            except (TypeError, ValueError):
+                return {"status": "Error 18 => Count and length must be numbers!!!"}
+            if count < 1 or length < 1:
+                return {"status": "Error 18 => Count and length must be numbers!!!"}
+            with self.lock:
+                frequencyList = lM.getFrequencyList(count, length, bool(request.get("exact", False)))
+            return {"status": 0, "list": frequencyList}
+
+        elif command == "export":
+            # Exporting fills in the frequency lists, which frequency requests also do
+            with self.lock:
+                status = lM.exportLists(request.get("file", "Lists.xlsx"))
+            return {"status": status}
+
+        return {"status": "Error 9 => Unknown command!!! " + str(command)}
+
+
+class ListMakerRequestHandler(socketserver.StreamRequestHandler):
+    """
+        A class to read JSON line requests from a connection and write back JSON line responses.
+        """
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {"status": "Error 12 => Request is not valid JSON!!!"}
+            else:
+                # Always answer, so one bad request never drops the connection
+                try:
+                    response = self.server.service.handleRequest(request)
+                except Exception as error:
+                    response = {"status": "Error 21 => Request failed!!! " + repr(error)}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class ListMakerTcpServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class ListMakerUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+def runService(versesFileName, port = 3267, socketPath = None):
+    """
+    Function to load the material and serve requests until interrupted.
+
+    Parameters:
+        versesFileName (str): The input filename for verse list.
+        port (int): The localhost port to listen on (Defaults to 3267).
+        socketPath (str): A Unix socket path to listen on instead of a port (Defaults to None).
+
+    Returns:
+        (0): No errors, (Anything else): Errors.
+    """
+
+    if socketPath and not hasattr(socketserver, "UnixStreamServer"):
+        return "Error 24 => Unix sockets are not supported on this system!!! " + str(socketPath)
+
+    service = ListMakerService(versesFileName)
+    status = service.loadMaterial()
+    if status != 0: return status
+
+    if socketPath:
+        if Path(socketPath).exists():
+            Path(socketPath).unlink()
+        server = ListMakerUnixServer(socketPath, ListMakerRequestHandler)
+        print("Serving on " + socketPath)
+    else:
+        server = ListMakerTcpServer(("127.0.0.1", port), ListMakerRequestHandler)
+        print("Serving on 127.0.0.1:" + str(port))
+    server.service = service
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socketPath and Path(socketPath).exists():
+            Path(socketPath).unlink()
+
+    return 0  # Return with no errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Keep the material in memory and answer list requests.")
+    parser.add_argument("versesFile", nargs = "?", default = "../Data Files/Verses.xlsx",
+                        help = "The input material file")
+    parser.add_argument("--port", type = int, default = 3267, help = "The localhost port to listen on")
+    parser.add_argument("--socket", default = None, help = "A Unix socket path to listen on instead of a port")
+    args = parser.parse_args()
+
+    status = runService(args.versesFile, args.port, args.socket)
+    if status != 0: print(status)
@@ -0,0 +1,314 @@
+###################################################################################################
+# Name        : MaterialPack.py
+# Author(s)   : Chris Lloyd, Andrew Southwick
+# Description : Compiled, memory-mapped material packs so imports skip the xlsx
+# Github Link : https://github.com/Clloyd3267/List-Maker/
+###################################################################################################
+
+# External Imports
+from pathlib import Path # Used for file manipulation
+import array # Used to write the pack arrays
+import hashlib # Used to tell when the material file changes
+import mmap # Used to share the pack without copying it
+import os # Used to replace packs atomically
+import struct # Used to read and write the pack header
+import sys # Used to check the byte order of the pack
+
+# Pack layout: a header followed by the sections below, each starting on an 8 byte boundary
+#   verseOffsets (uint32 * (numVerses + 1)) Start of each verse text in the text blob (in characters)
+#   tokenOffsets (uint32 * (numVerses + 1)) Index of the first word of each verse in the word arrays
+#   tokenStarts  (uint32 * numTokens)       Start of each word in its verse text (in characters)
+#   tokenLengths (uint32 * numTokens)       Length of each word (in characters)
+#   tokenIds     (int32 * numTokens)        Interned uppercase word ID of each word
+#   references   (utf-8)                    Book, Chapter and Verse of every verse separated by "\0"
+#   text         (utf-8)                    All of the verse texts one after another
+#   vocabulary   (utf-8)                    The uppercase word of each word ID separated by "\0"
+PACK_MAGIC = b"LMPK"
+PACK_VERSION = 2
+PACK_HEADER = struct.Struct("<4sHHH32sIIIII")
+TOKENIZER_VERSION = 1  # Bump whenever ListMaker.splitVerse changes so packs of the old words are compiled again
+PACK_EXTENSION = ".lmpack"
+
+
+class MaterialPack:
+    """
+        A class to hold a loaded material pack.
+
+        The arrays are memoryviews of the memory-mapped file, so every process that loads the same pack
+        shares one copy of it.
+
+        Attributes:
+            fileName (str): The pack filename.
+            sourceHash (bytes): The SHA-256 hash of the material file the pack was compiled from.
+            verseOffsets (memoryview of uint32): Start of each verse text in the text.
+            tokenOffsets (memoryview of uint32): Index of the first word of each verse in the word arrays.
+            tokenStarts (memoryview of uint32): Start of each word in its verse text.
+            tokenLengths (memoryview of uint32): Length of each word.
+            tokenIds (memoryview of int32): Interned uppercase word ID of each word.
+            references (array of str): Book, Chapter and Verse of every verse one after another.
+            text (str): All of the verse texts one after another.
+            vocabulary (array of str): The uppercase word of each word ID.
+        """
+
+    def __init__(self, fileName):
+        """
+        The constructor for class MaterialPack.
+
+        Parameters:
+            fileName (str): The pack filename.
+        """
+
+        self.fileName = fileName
+        self.sourceHash = b""
+        self.verseOffsets = memoryview(b"").cast("I")
+        self.tokenOffsets = memoryview(b"").cast("I")
+        self.tokenStarts = memoryview(b"").cast("I")
+        self.tokenLengths = memoryview(b"").cast("I")
+        self.tokenIds = memoryview(b"").cast("i")
+        self.references = []
+        self.text = ""
+        self.vocabulary = []
+        self.map = None
+
+    def createVerses(self):
+        """
+        Function to create verses in the same form as ListMaker.importVerses from the pack.
+
+        Returns:
+            allVerses (array of verse objects): Book, Chapter, Verse, Verse Text and split verse of each verse.
+        """
+
+        allVerses = []
+        text = self.text
+        references = self.references
+        verseOffsets = self.verseOffsets.tolist()
+        tokenOffsets = self.tokenOffsets.tolist()
+        tokenStarts = self.tokenStarts.tolist()
+        tokenLengths = self.tokenLengths.tolist()
+        for i in range(len(verseOffsets) - 1):
+            verseText = text[verseOffsets[i]:verseOffsets[i + 1]]
+            splitVerse = [[verseText[start:start + length], start] for start, length in
+                          zip(tokenStarts[tokenOffsets[i]:tokenOffsets[i + 1]],
+                              tokenLengths[tokenOffsets[i]:tokenOffsets[i + 1]])]
+            allVerses.append([references[3 * i], references[3 * i + 1], references[3 * i + 2], verseText, splitVerse])
+        return allVerses
+
+    def close(self):
+        """
+        Function to release the memory map of the pack.
+
+        Returns:
+            (bool): Whether the map was closed (It stays open while anything still uses the arrays).
+        """
+
+        try:
+            for view in [self.verseOffsets, self.tokenOffsets, self.tokenStarts, self.tokenLengths, self.tokenIds]:
+                view.release()
+            if self.map is not None:
+                self.map.close()
+                self.map = None
+        except BufferError:
+            return False
+        return True
+
+
+def getPackFileName(versesFileName):
+    """
+    Function to get the pack filename for a material file.
+
+    Parameters:
+        versesFileName (str): The input filename for verse list.
+
+    Returns:
+        packFileName (str): The material filename with the pack extension.
+    """
+
+    return str(Path(versesFileName).with_suffix(PACK_EXTENSION))
+
+
+def hashMaterial(versesFileName):
+    """
+    Function to hash a material file.
+
+    Parameters:
+        versesFileName (str): The input filename for verse list.
+
+    Returns:
+        sourceHash (bytes): The SHA-256 hash of the file, or None if it can not be read.
+    """
+
+    digest = hashlib.sha256()
+    try:
+        with open(versesFileName, "rb") as versesFile:
+            for block in iter(lambda: versesFile.read(1 << 20), b""):
+                digest.update(block)
+    except IOError:
+        return None
+    return digest.digest()
+
+
+def writePack(allVerses, sourceHash, packFileName):
+    """
+    Function to compile verses into a material pack.
+
+    Parameters:
+        allVerses (array of verse objects): The verses from ListMaker.importVerses.
+        sourceHash (bytes): The SHA-256 hash of the material file.
+        packFileName (str): The pack filename.
+
+    Returns:
+        (0): No errors, (Anything else): Errors.
+    """
+
+    verseOffsets = array.array("I", [0])
+    tokenOffsets = array.array("I", [0])
+    tokenStarts = array.array("I")
+    tokenLengths = array.array("I")
+    tokenIds = array.array("i")
+    wordIds = {}
+    references = []
+    texts = []
+    for verse in allVerses:
+        references += verse[0:3]
+        texts.append(verse[3])
+        verseOffsets.append(verseOffsets[-1] + len(verse[3]))
+        tokenOffsets.append(tokenOffsets[-1] + len(verse[4]))
+        for word in verse[4]:
+            tokenStarts.append(word[1])
+            tokenLengths.append(len(word[0]))
+            tokenIds.append(wordIds.setdefault(str(word[0]).upper(), len(wordIds)))
+
+    blobs = ["\0".join(references).encode("utf-8"), "".join(texts).encode("utf-8"),
+             "\0".join(wordIds).encode("utf-8")]
+    byteOrder = 0 if sys.byteorder == "little" else 1
+    header = PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, byteOrder, TOKENIZER_VERSION, sourceHash, len(allVerses),
+                              len(tokenIds), len(blobs[0]), len(blobs[1]), len(blobs[2]))
+
+    # Write to a temporary file first so a reader never sees a half written pack
+    tempFileName = packFileName + ".tmp"
+    try:
+        with open(tempFileName, "wb") as packFile:
+            packFile.write(header)
+            for section in [verseOffsets, tokenOffsets, tokenStarts, tokenLengths, tokenIds] + blobs:
+                packFile.write(b"\0" * (-packFile.tell() % 8))
+                packFile.write(section if isinstance(section, bytes) else section.tobytes())
+        os.replace(tempFileName, packFileName)
+    except OSError:
+        return "Error 14 => Material pack could not be written!!! " + str(packFileName)
+
+    return 0  # Return with no errors
+
+
+def readPackHeader(packFileName):
+    """
+    Function to read the header of a material pack.
+
+    Parameters:
+        packFileName (str): The pack filename.
+
+    Returns:
+        header (tuple): The unpacked header, or None if the file is missing or not a current pack (Including packs
+                        split with an older ListMaker.splitVerse).
+    """
+
+    try:
+        with open(packFileName, "rb") as packFile:
+            data = packFile.read(PACK_HEADER.size)
+    except IOError:
+        return None
+    if len(data) != PACK_HEADER.size:
+        return None
+
+    header = PACK_HEADER.unpack(data)
+    if header[0] != PACK_MAGIC or header[1] != PACK_VERSION or header[2] != (0 if sys.byteorder == "little" else 1) \
+    or header[3] != TOKENIZER_VERSION:
+        return None
+    return header
+
+
+def loadPack(packFileName, sourceHash = None):
+    """
+    Function to load a material pack with mmap.
+
+    Parameters:
+        packFileName (str): The pack filename.
+        sourceHash (bytes): The hash the pack must have been compiled from (Defaults to None for any hash).
+
+    Returns:
+        pack (MaterialPack): The loaded pack, or None if it is missing, out of date or not a current pack.
+    """
+
+    header = readPackHeader(packFileName)
+    if header is None or (sourceHash is not None and header[4] != sourceHash):
+        return None
+    _, _, _, _, packHash, numVerses, numTokens, referencesBytes, textBytes, vocabularyBytes = header
+
+    pack = MaterialPack(packFileName)
+    pack.sourceHash = packHash
+    with open(packFileName, "rb") as packFile:
+        try:
+            pack.map = mmap.mmap(packFile.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:
+            return None
+
+    # Find each section in the order it was written and check the whole pack is there before slicing it
+    position = PACK_HEADER.size
+    bounds = []
+    for size in [4 * (numVerses + 1), 4 * (numVerses + 1), 4 * numTokens, 4 * numTokens, 4 * numTokens,
+                 referencesBytes, textBytes, vocabularyBytes]:
+        position += -position % 8
+        bounds.append((position, position + size))
+        position += size
+    if position > len(pack.map):
+        pack.close()
+        return None
+
+    # A damaged pack is treated as missing so it gets compiled again
+    try:
+        with memoryview(pack.map) as view:
+            pack.verseOffsets, pack.tokenOffsets, pack.tokenStarts, pack.tokenLengths = \
+                [view[start:end].cast("I") for start, end in bounds[0:4]]
+            pack.tokenIds = view[bounds[4][0]:bounds[4][1]].cast("i")
+            pack.references = str(view[bounds[5][0]:bounds[5][1]], "utf-8").split("\0") if referencesBytes else []
+            pack.text = str(view[bounds[6][0]:bounds[6][1]], "utf-8")
+            pack.vocabulary = str(view[bounds[7][0]:bounds[7][1]], "utf-8").split("\0") if vocabularyBytes else []
+    except (ValueError, UnicodeDecodeError, BufferError):
+        pack.close()
+        return None
+
+    if len(pack.references) != 3 * numVerses or pack.verseOffsets[numVerses] != len(pack.text) or \
+    pack.tokenOffsets[numVerses] != numTokens or not checkPackBounds(pack, len(pack.vocabulary)):
+        pack.close()
+        return None
+
+    return pack
+
+
+def checkPackBounds(pack, vocabularySize):
+    """
+    Function to check every offset of a loaded pack points inside the section it indexes.
+
+    Parameters:
+        pack (MaterialPack): The loaded pack.
+        vocabularySize (int): The number of words in the pack vocabulary.
+
+    Returns:
+        (bool): Whether every verse and word of the pack is in bounds.
+    """
+
+    verseOffsets = pack.verseOffsets.tolist()
+    tokenOffsets = pack.tokenOffsets.tolist()
+    if verseOffsets[0] != 0 or tokenOffsets[0] != 0:
+        return False
+    if len(pack.tokenIds) and (min(pack.tokenIds) < 0 or max(pack.tokenIds) >= vocabularySize):
+        return False
+
+    # Every word has to end inside its own verse text
+    tokenEnds = [start + length for start, length in zip(pack.tokenStarts.tolist(), pack.tokenLengths.tolist())]
+    for i in range(len(verseOffsets) - 1):
+        if verseOffsets[i + 1] < verseOffsets[i] or tokenOffsets[i + 1] < tokenOffsets[i]:
+            return False
+        if tokenOffsets[i + 1] != tokenOffsets[i] and \
+        max(tokenEnds[tokenOffsets[i]:tokenOffsets[i + 1]]) > verseOffsets[i + 1] - verseOffsets[i]:
+            return False
+    return True
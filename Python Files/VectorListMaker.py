@@ -0,0 +1,323 @@
+###################################################################################################
+# Name        : VectorListMaker.py
+# Author(s)   : Chris Lloyd, Andrew Southwick
+# Description : A ListMaker that counts words and phrases with NumPy
+# Github Link : https://github.com/Clloyd3267/List-Maker/
+###################################################################################################
+
+# External Imports
+import numpy as np # Used to count words and phrases
+from operator import itemgetter # Used to group occurrences by word
+
+# Internal Imports
+from ListMaker import ListMaker
+
+
+class VectorListMaker(ListMaker):
+    """
+        A class to create the same lists as ListMaker with the counting done by NumPy.
+
+        The verses are stored as one flat array of interned word IDs, so word counts and the unique word and
+        phrase checks come from np.unique and np.bincount instead of Python dictionary loops.
+
+        Attributes:
+            vocabulary (array of str): The uppercase word of each word ID.
+            tokenIds (numpy int32 array): The word ID of every word in the material in order.
+            tokenVerses (numpy int32 array): The index in allVerses of every word in the material.
+            verseOffsets (numpy int64 array): The index in tokenIds of the first word of each verse (and the end).
+            verseRefs (numpy int32 array): The reference ID of each verse, shared by verses with the same reference.
+        """
+
+    def __init__(self):
+        """
+        The constructor for class VectorListMaker.
+        """
+
+        ListMaker.__init__(self)
+        self.vocabulary = []
+        self.tokenIds = np.zeros(0, dtype = np.int32)
+        self.tokenVerses = np.zeros(0, dtype = np.int32)
+        self.verseOffsets = np.zeros(1, dtype = np.int64)
+        self.verseRefs = np.zeros(0, dtype = np.int32)
+
+    ####################################################################################################################
+    # Main Funcs
+    ####################################################################################################################
+    def createCorpus(self):
+        """
+        Function to intern the words of all verses into the flat word ID arrays.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        # Share the word IDs of the material pack when the verses all came from it
+        pack = self.materialPack
+        if pack is not None and len(pack.tokenOffsets) == len(self.allVerses) + 1:
+            self.vocabulary = pack.vocabulary
+            self.tokenIds = np.frombuffer(pack.tokenIds, dtype = np.int32)
+            self.verseOffsets = np.frombuffer(pack.tokenOffsets, dtype = np.uint32).astype(np.int64)
+            verseLengths = np.diff(self.verseOffsets)
+            self.tokenVerses = np.repeat(np.arange(len(verseLengths), dtype = np.int32), verseLengths)
+            refIds = {}
+            self.verseRefs = np.array([refIds.setdefault((verse[0], verse[1], verse[2]), len(refIds))
+                                       for verse in self.allVerses], dtype = np.int32)
+            return 0  # Return with no errors
+
+        # Give each word an ID in order of first occurrence
+        words = [str(word[0]).upper() for verse in self.allVerses for word in verse[4]]
+        wordIds = dict.fromkeys(words)
+        for wordId, word in enumerate(wordIds):
+            wordIds[word] = wordId
+
+        refIds = {}
+        verseRefs = [refIds.setdefault((verse[0], verse[1], verse[2]), len(refIds)) for verse in self.allVerses]
+        verseLengths = [len(verse[4]) for verse in self.allVerses]
+
+        self.vocabulary = list(wordIds)
+        self.tokenIds = np.array(list(map(wordIds.__getitem__, words)), dtype = np.int32)
+        self.verseOffsets = np.zeros(len(verseLengths) + 1, dtype = np.int64)
+        np.cumsum(verseLengths, out = self.verseOffsets[1:])
+        self.tokenVerses = np.repeat(np.arange(len(verseLengths), dtype = np.int32), verseLengths)
+        self.verseRefs = np.array(verseRefs, dtype = np.int32)
+
+        return 0  # Return with no errors
+
+    def closeMaterial(self):
+        """
+        Function to copy the word IDs off the material pack and then close it.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+        """
+
+        if self.materialPack is not None:
+            self.tokenIds = np.array(self.tokenIds)
+        return ListMaker.closeMaterial(self)
+
+    def createConcordance(self):
+        """
+        Function to create list of occurrences of words.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+
+        Debug Code: "C" or "c" or "On"
+        """
+
+        status = self.createCorpus()
+        if status != 0: return status
+
+        # Create the occurrence of every word in the material in order, with the word marked in the verse
+        occurrences = []
+        for verse in self.allVerses:
+            book, chapter, verseNumber, verseText = verse[0], verse[1], verse[2], verse[3]
+            occurrences += [[book, chapter, verseNumber, verseText[0:word[1]] + "◆" + verseText[word[1] + len(word[0]):]]
+                            for word in verse[4]]
+
+        # Group the occurrences by word ID with a stable sort, then slice out each word's occurrences
+        counts = np.bincount(self.tokenIds, minlength = len(self.vocabulary))
+        if len(occurrences) > 1:
+            occurrences = itemgetter(*np.argsort(self.tokenIds, kind = "stable").tolist())(occurrences)
+        bounds = np.concatenate(([0], np.cumsum(counts))).tolist()
+        for word, count, start, end in zip(self.vocabulary, counts.tolist(), bounds, bounds[1:]):
+            if word in self.concordance:
+                self.concordance[word][0] += count
+                self.concordance[word][1] += occurrences[start:end]
+            else:
+                self.concordance[word] = [count, list(occurrences[start:end])]
+
+        # Print Concordance if debug enabled
+        if self.debug != "Off" and ("C" in self.debug or "c" in self.debug or self.debug == "On"):
+            print("")
+            print("=== Concordance (" + str(len(self.concordance)) + ") ===")
+            for word, value in sorted(self.concordance.items()):
+                print(word + " (" + str(self.concordance[word][0]) + ")")
+                for occurrence in self.concordance[word][1]:
+                    print(" -> " + occurrence[0] + " " + occurrence[1] + ":" + occurrence[2] + " " + str(occurrence[3]))
+
+        return 0  # Return with no errors
+
+    def createUniqueWords(self):
+        """
+        Function to create list of all Unique Words.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+
+        Debug Code: "U" or "u" or "On"
+        """
+
+        self.addUniquePhrases(self.uniqueWords, np.arange(len(self.tokenIds)), self.tokenIds, len(self.vocabulary), 1)
+
+        # Print Unique Words if debug enabled
+        if self.debug != "Off" and ("U" in self.debug or "u" in self.debug or self.debug == "On"):
+            print("")
+            print("=== Unique Words (" + str(len(self.uniqueWords)) + ") ===")
+            for word, value in sorted(self.uniqueWords.items()):
+                print(word + " - " + value[0] + " " + value[1] + ":" + value[2])
+
+        return 0  # Return with no errors
+
+    def createTwoWordPhrases(self):
+        """
+        Function to create list of two word phrases.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+
+        Debug Code: "2" or "On"
+        """
+
+        positions, phraseIds, numPhrases, words = self.createPhraseIds(2)
+        uniqueWords = self.wordsIn(self.uniqueWords)
+        valid = ~(uniqueWords[words[0]] | uniqueWords[words[1]])
+
+        self.addUniquePhrases(self.twoWordPhrases, positions[valid], phraseIds[valid], numPhrases, 2)
+
+        # Print Two Word Phrases if debug enabled
+        if self.debug != "Off" and ("2" in self.debug or self.debug == "On"):
+            print("")
+            print("=== Two Word Phrases (" + str(len(self.twoWordPhrases)) + ") ===")
+            for phrase, verse in sorted(self.twoWordPhrases.items()):
+                print(phrase + " - " + verse[0] + " " + verse[1] + ":" + verse[2])
+
+        return 0  # Return with no errors
+
+    def createThreeWordPhrases(self):
+        """
+        Function to create list of three word phrases.
+
+        Returns:
+            (0): No errors, (Anything else): Errors.
+
+        Debug Code: "3" or "On"
+        """
+
+        positions, phraseIds, numPhrases, words = self.createPhraseIds(3)
+        uniqueWords = self.wordsIn(self.uniqueWords)
+        valid = ~(uniqueWords[words[0]] | uniqueWords[words[1]] | uniqueWords[words[2]])
+
+        # Leave out phrases that start or end with a unique two word phrase
+        twoWordPhrases = self.phrasesIn(self.twoWordPhrases)
+        valid &= ~np.isin(words[0] * len(self.vocabulary) + words[1], twoWordPhrases)
+        valid &= ~np.isin(words[1] * len(self.vocabulary) + words[2], twoWordPhrases)
+
+        self.addUniquePhrases(self.threeWordPhrases, positions[valid], phraseIds[valid], numPhrases, 3)
+
+        # Print Three Word Phrases if debug enabled
+        if self.debug != "Off" and ("3" in self.debug or self.debug == "On"):
+            print("")
+            print("=== Three Word Phrases (" + str(len(self.threeWordPhrases)) + ") ===")
+            for phrase, verse in sorted(self.threeWordPhrases.items()):
+                print(phrase + " - " + verse[0] + " " + verse[1] + ":" + verse[2])
+
+        return 0  # Return with no errors
+
+    ####################################################################################################################
+    # Helper Funcs
+    ####################################################################################################################
+    def createPhraseIds(self, length):
+        """
+        Function to give every phrase of a number of words within a verse a dense phrase ID.
+
+        Parameters:
+            length (int): The number of words in each phrase.
+
+        Returns:
+            (positions, phraseIds, numPhrases, words) (tuple): The index in tokenIds where each phrase starts,
+            the phrase ID of each of those phrases, the number of distinct phrases and the word IDs of each
+            word of the phrases.
+        """
+
+        numTokens = len(self.tokenIds)
+        if numTokens < length:
+            empty = np.zeros(0, dtype = np.int64)
+            return empty, empty, 0, [empty] * length
+
+        # Phrases may not cross into the next verse
+        positions = np.arange(numTokens - length + 1, dtype = np.int64)
+        valid = self.tokenVerses[positions] == self.tokenVerses[positions + length - 1]
+        positions = positions[valid]
+        words = [self.tokenIds[positions + i].astype(np.int64) for i in range(length)]
+
+        # Pack one word at a time, making the IDs dense after each so the keys can never overflow
+        phraseIds = words[0]
+        numPhrases = len(self.vocabulary)
+        for i in range(1, length):
+            phraseIds, inverse = np.unique(phraseIds * len(self.vocabulary) + words[i], return_inverse = True)
+            numPhrases = len(phraseIds)
+            phraseIds = inverse.reshape(-1)
+
+        return positions, phraseIds, numPhrases, words
+
+    def findSingleReference(self, ids, numIds, positions):
+        """
+        Function to find which IDs only ever occur in a single reference.
+
+        Parameters:
+            ids (numpy array): The ID at each position.
+            numIds (int): The number of distinct IDs.
+            positions (numpy array): The index in tokenIds of each ID.
+
+        Returns:
+            singleReference (numpy bool array): True for each ID that occurs in exactly one reference.
+        """
+
+        refs = self.verseRefs[self.tokenVerses[positions]].astype(np.int64)
+        pairs = np.sort(ids.astype(np.int64) * (len(self.verseRefs) + 1) + refs)
+        pairs = pairs[np.concatenate((pairs[:1] == pairs[:1], pairs[1:] != pairs[:-1]))]
+        return np.bincount(pairs // (len(self.verseRefs) + 1), minlength = numIds) == 1
+
+    def addUniquePhrases(self, phrases, positions, phraseIds, numPhrases, length):
+        """
+        Function to add every word or phrase that only occurs in a single reference to a dictionary of phrases.
+
+        Parameters:
+            phrases (dictionary of word objects): The dictionary to add the phrases to.
+            positions (numpy array): The index in tokenIds where each phrase starts.
+            phraseIds (numpy array): The phrase ID of each phrase.
+            numPhrases (int): The number of distinct phrase IDs.
+            length (int): The number of words in each phrase.
+        """
+
+        singleReference = self.findSingleReference(phraseIds, numPhrases, positions)
+        firstIds, firstPositions = np.unique(phraseIds, return_index = True)
+        starts = positions[firstPositions[singleReference[firstIds]]]
+        tokenIds = self.tokenIds.tolist()
+        for start, verse in zip(starts.tolist(), self.tokenVerses[starts].tolist()):
+            phrases[" ".join([self.vocabulary[wordId] for wordId in tokenIds[start:start + length]])] = \
+                self.allVerses[verse][0:3]
+
+    def wordsIn(self, words):
+        """
+        Function to mark which word IDs are in a dictionary of words.
+
+        Parameters:
+            words (dictionary of word objects): The words to mark.
+
+        Returns:
+            marked (numpy bool array): True for each word ID whose word is in the dictionary.
+        """
+
+        return np.array([word in words for word in self.vocabulary], dtype = bool).reshape(-1)
+
+    def phrasesIn(self, phrases):
+        """
+        Function to get the packed word ID keys of the two word phrases in a dictionary of phrases.
+
+        Parameters:
+            phrases (dictionary of word objects): The two word phrases to pack.
+
+        Returns:
+            keys (numpy int64 array): The first word ID times the vocabulary size plus the second word ID of each
+            phrase whose words are both in the vocabulary.
+        """
+
+        wordIds = {word: wordId for wordId, word in enumerate(self.vocabulary)}
+        keys = []
+        for phrase in phrases:
+            words = phrase.split(" ")
+            if len(words) == 2 and words[0] in wordIds and words[1] in wordIds:
+                keys.append(wordIds[words[0]] * len(self.vocabulary) + wordIds[words[1]])
+        return np.array(keys, dtype = np.int64)